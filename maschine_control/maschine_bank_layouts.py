@@ -0,0 +1,121 @@
+#
+# maschine / ableton
+# maschine_bank_layouts.py
+#
+# created by Ahmed Emerah - (MaXaR)
+#
+# NI user name: Emerah
+# NI: Machine MK3, KK S49 MK2, Komplete 12.
+# email: ahmed.emerah@icloud.com
+#
+# developed using python 2.7.17 on macOS Catalina
+# tools: VS Code (Free)
+#
+from __future__ import absolute_import, print_function, unicode_literals
+
+from ableton.v2.base.live_api_utils import liveobj_valid
+from ableton.v2.control_surface.banking_util import BankingInfo
+
+PLUGIN_CLASSES = ('PluginDevice', 'AuPluginDevice', 'MxDeviceAudioEffect', 'MxDeviceInstrument', 'MxDeviceMidiEffect')
+
+
+def bank_layout_key(device):
+    """returns the key devices with the same bank layout share.
+    native devices share a layout per device class. plugins and max devices share a layout per
+    device name and parameter count. the device name is the instance name the user can change,
+    so a renamed plugin resolves its layout again, and two different plugins with the same
+    name and parameter count share a layout.
+    """
+    class_name = device.class_name
+    if class_name in PLUGIN_CLASSES:
+        return (class_name, device.name, len(device.parameters))
+    return (class_name, '', 0)
+
+
+class MaschineBankingInfo(BankingInfo):
+    """
+    banking info that keeps the resolved bank layout per bank_layout_key(): the bank count,
+    the bank names, and the name and parameter index of every bank slot. switching back and forth
+    between devices reads the layout from the cache instead of resolving the bank definitions again.
+
+    the parameters of a native device class never change. a plugin can expose a different parameter
+    list per instance, so its parameter count is part of its key.
+    the device component invalidates the layout of a device when its parameter list changes.
+    """
+
+    def __init__(self, *a, **k):
+        super(MaschineBankingInfo, self).__init__(*a, **k)
+        self._layouts = {}
+        self.hits = 0
+        self.misses = 0
+
+    def device_bank_count(self, device, *a, **k):
+        return self._cached_layout_value(device, ('count',) + a + tuple(sorted(k.items())),
+                                         lambda: super(MaschineBankingInfo, self).device_bank_count(device, *a, **k))
+
+    def device_bank_names(self, device, *a, **k):
+        return self._cached_layout_value(device, ('names',) + a + tuple(sorted(k.items())),
+                                         lambda: super(MaschineBankingInfo, self).device_bank_names(device, *a, **k))
+
+    def bank_parameters(self, device, bank_index):
+        """returns the cached (bank name, ((parameter index, name), ...)) of a bank, or None when it is not cached.
+        a parameter index is None for an empty bank slot.
+        Arguments:
+            device {Device} -- the selected device
+            bank_index {int} -- index of the bank
+        """
+        details = self._layouts.get(bank_layout_key(device), {}).get(('bank', bank_index))
+        if details is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return details
+
+    def store_bank_parameters(self, device, bank_index, bank_name, parameters):
+        """caches the parameters of a bank as indices into the device parameter list.
+        banks with parameters that are not in the device parameter list, like the wrapper
+        parameters of decorated devices, are not cached.
+        Arguments:
+            device {Device} -- the selected device
+            bank_index {int} -- index of the bank
+            bank_name {string} -- name of the bank
+            parameters {list} -- (parameter, name) of every bank slot
+        """
+        positions = {}
+        for index, parameter in enumerate(device.parameters):
+            live_ptr = getattr(parameter, '_live_ptr', None)
+            if live_ptr is not None:
+                positions[live_ptr] = index
+        indexed_names = []
+        for parameter, name in parameters:
+            index = None
+            if liveobj_valid(parameter):
+                index = positions.get(getattr(parameter, '_live_ptr', None))
+                if index is None:
+                    return
+            indexed_names.append((index, name))
+        self._layouts.setdefault(bank_layout_key(device), {})[('bank', bank_index)] = (bank_name, tuple(indexed_names))
+
+    def invalidate(self, device=None):
+        """forgets the layouts of a device for any parameter count, or all layouts when device is None"""
+        if device is None:
+            self._layouts.clear()
+        elif liveobj_valid(device):
+            class_name, device_name, _ = bank_layout_key(device)
+            for key in [key for key in self._layouts if key[:2] == (class_name, device_name)]:
+                del self._layouts[key]
+
+    def _cached_layout_value(self, device, key, resolve):
+        try:
+            hash(key)
+        except TypeError:
+            return resolve()
+        if not liveobj_valid(device):
+            return resolve()
+        layout = self._layouts.setdefault(bank_layout_key(device), {})
+        if key in layout:
+            self.hits += 1
+        else:
+            self.misses += 1
+            layout[key] = resolve()
+        return layout[key]
@@ -19,7 +19,6 @@ from functools import partial
 from ableton.v2.base import task
 from ableton.v2.base.dependency import inject
 from ableton.v2.base.util import const
-from ableton.v2.control_surface.banking_util import BankingInfo
 from ableton.v2.control_surface.components.auto_arm import AutoArmComponent
 from ableton.v2.control_surface.control_surface import ControlSurface
 from ableton.v2.control_surface.default_bank_definitions import BANK_DEFINITIONS
@@ -28,22 +27,27 @@ from ableton.v2.control_surface.elements.full_velocity_element import FullVeloci
 from ableton.v2.control_surface.layer import Layer
 from ableton.v2.control_surface.mode import LayerMode, Mode, ModesComponent
 
+from .maschine_bank_layouts import MaschineBankingInfo
 from .maschine_clip_position import MaschineClipPositionIndicator
 from .maschine_device import MaschineDevice
 from .maschine_device_navigation import MaschineDeviceNavigation
 from .maschine_device_parameter import MaschineDeviceParameter
 from .maschine_drums import MaschineDrumRack
-from .maschine_elements import MaschineElements
+from .maschine_elements import MaschineElements, MaschineLedState
 from .maschine_info_display import MaschineInfoDisplay
 from .maschine_keyboard import MaschineKeyboard
 from .maschine_note_repeat import MaschineNoteRepeatEnabler
+from .maschine_parameter_morph import MaschineParameterMorphEnabler
 from .maschine_playable_modes import MaschinePlayableModes
 from .maschine_recording import MaschineRecording
 from .maschine_skin import maschine_skin
+from .maschine_track_context import MaschineTrackContextPresenter
 from .maschine_track_creation import MaschineTrackCreation
 from .maschine_track_navigation import MaschineTrackNavigator
+from .maschine_track_search import MaschineTrackSearchEnabler
 from .maschine_track_selection import MaschineTrackProvider
 from .maschine_track_selection import MaschineTrackSelection
+from .maschine_traffic_monitor import MaschineTrafficMonitor, MaschineTrafficReport
 from .maschine_transport import MaschineTransport
 from .maschine_view import MaschineView
 from .maschine_welcome import MaschineWelcome
@@ -57,12 +61,21 @@ class MaschineControlSurface(ControlSurface):
 
     def __init__(self, *a, **k):
         super(MaschineControlSurface, self).__init__(*a, **k)
-        self._maschine_injector = inject(element_container=const(None), info_display=const(None)).everywhere()
+        self._maschine_injector = inject(element_container=const(None), info_display=const(None), traffic_monitor=const(None),
+                                         track_provider=const(None), track_presenter=const(None)).everywhere()
+        self._traffic_monitor = MaschineTrafficMonitor()
+        self._led_state = MaschineLedState()
         with self.component_guard():
-            self._info_display = MaschineInfoDisplay()
-            with inject(skin=const(maschine_skin)).everywhere():
-                self._elements = MaschineElements()
-        self._maschine_injector = inject(element_container=const(self._elements), info_display=const(self._info_display)).everywhere()
+            with inject(traffic_monitor=const(self._traffic_monitor), led_state=const(self._led_state)).everywhere():
+                self._info_display = MaschineInfoDisplay()
+                with inject(skin=const(maschine_skin)).everywhere():
+                    self._elements = MaschineElements()
+                self._track_provider = self.register_disconnectable(MaschineTrackProvider())
+            self._track_presenter = self.register_disconnectable(MaschineTrackContextPresenter(info_display=self._info_display,
+                                                                                               track_provider=self._track_provider))
+        self._maschine_injector = inject(element_container=const(self._elements), info_display=const(self._info_display),
+                                         traffic_monitor=const(self._traffic_monitor), track_provider=const(self._track_provider),
+                                         track_presenter=const(self._track_presenter)).everywhere()
         with self.component_guard():
             self.create_auto_arm_component()
             self.create_view_switcher_component()
@@ -77,17 +90,26 @@ class MaschineControlSurface(ControlSurface):
             self.create_playable_mode()
             self.create_pad_matrix_modes()
             self.create_device_component()
+            self.create_parameter_morph_component()
             self.create_main_modes()
+            self.create_track_search_component()
             self.create_welcome_component()
+            self.create_traffic_report_component()
         self.set_feedback_channels(FEEDBACK_CHANNELS)
         self._show_welcome_message()
         self.show_message('Maschine MKiii - ' + str(self.live_version))
 
     def disconnect(self):
         self._info_display.clear_all_displays()
+        self._info_display.flush()
         self._autoarm.set_enabled(False)
         super(MaschineControlSurface, self).disconnect()
 
+    def refresh_state(self):
+        self._info_display.invalidate()
+        self._led_state.invalidate()
+        super(MaschineControlSurface, self).refresh_state()
+
     @contextmanager
     def _component_guard(self):
         with super(MaschineControlSurface, self)._component_guard():
@@ -105,15 +127,9 @@ class MaschineControlSurface(ControlSurface):
     def _show_welcome_message(self):
         welcome = 'Welcome to Maschine MKiii'
         live_version = '{}'.format(self.live_version)
-        display_welcome = partial(self._info_display.display_message_on_maschine, welcome, 0)
-        clear_display = partial(self._info_display.clear_display, 0)
-        self._tasks.add(task.sequence(task.run(display_welcome), task.wait(1), task.run(clear_display), task.wait(0.2),
-                                      task.run(partial(self._info_display.display_message_on_maschine, self._main_modes.selected_mode.replace('_', ' '), 0))))
-
-        display_live_version = partial(self._info_display.display_message_on_maschine, live_version, 2)
-        clear_display = partial(self._info_display.clear_display, 2)
-        self._tasks.add(task.sequence(task.run(display_live_version), task.wait(1), task.run(clear_display), task.wait(0.2),
-                                      task.run(partial(self._info_display.display_message_on_maschine, 'Track - {}'.format(self.song.view.selected_track.name), 2))))
+        self._info_display.display_message_on_maschine(self._main_modes.selected_mode.replace('_', ' '), 0)
+        self._info_display.display_temporary_message_on_maschine(welcome, 0, 1.2)
+        self._info_display.display_temporary_message_on_maschine(live_version, 2, 1.2)
 
     def create_auto_arm_component(self):
         self._autoarm = AutoArmComponent(name='AutoArm')
@@ -123,6 +139,10 @@ class MaschineControlSurface(ControlSurface):
         self._welcome.layer = Layer(pads='pad_matrix', group_buttons='group_matrix')
         self._tasks.add(task.sequence(task.wait(2), task.run(partial(self._welcome.set_enabled, False))))
 
+    def create_traffic_report_component(self):
+        self._traffic_report = MaschineTrafficReport(log_message=self.log_message, name='Traffic_Report')
+        self._traffic_report.layer = Layer(report_button='traffic_report_button')
+
     def create_view_switcher_component(self):
         self._view_switcher = MaschineView(name='View_Switcher', is_enabled=False)
         self._view_switcher.layer = Layer(view_button='arranger_button')
@@ -168,8 +188,9 @@ class MaschineControlSurface(ControlSurface):
                                      previous_scale_button='pad_mode_button', next_key_button='next_key_button', previous_key_button='previous_key_button')
 
     def create_track_selection_matrix_component(self):
-        self._track_selection_matrix = MaschineTrackSelection(track_provider=MaschineTrackProvider(), name='Track_Selection_Matrix', is_enabled=False)
-        self._track_selection_matrix.layer = Layer(select_buttons='selection_matrix', previous_track_page_button='chords_button', next_track_page_button='step_button')
+        self._track_selection_matrix = MaschineTrackSelection(track_provider=self._track_provider, name='Track_Selection_Matrix', is_enabled=False)
+        self._track_selection_matrix.layer = Layer(select_buttons='selection_matrix', previous_track_page_button='chords_button', next_track_page_button='step_button',
+                                                   parent_group_button='parent_group_button', track_hierarchy_button='track_hierarchy_button')
 
     def create_playable_mode(self):
         self._playable_mode = MaschinePlayableModes(drum_rack=self._drum_rack, keyboard=self._keyboard, name='Playable_Modes', is_enabled=False)
@@ -182,17 +203,32 @@ class MaschineControlSurface(ControlSurface):
         self._pad_modes.selected_mode = 'track_selection_mode'
 
     def create_device_component(self):
-        banking_info = BankingInfo(BANK_DEFINITIONS)
+        banking_info = MaschineBankingInfo(BANK_DEFINITIONS)
         decorator_factory = DeviceDecoratorFactory()
         self._device = MaschineDevice(device_decorator_factory=decorator_factory, banking_info=banking_info, device_bank_registry=self._device_bank_registry, name='Device')
         self._device_parameter = MaschineDeviceParameter(parameter_provider=self._device, name='Device_Parameter')
         self._device_navigation = MaschineDeviceNavigation(device_component=self._device, name='Device_Navigation')
         self._track_navigation = MaschineTrackNavigator(name='Track_Navigator')
 
+    def create_parameter_morph_component(self):
+        self._parameter_morph = MaschineParameterMorphEnabler(device_component=self._device, name='Parameter_Morph_Enabler', is_enabled=False)
+        self._parameter_morph.layer = Layer(morph_button='duplicate_button', capture_a_button='console_buttons[3]', capture_b_button='capture_morph_b_button')
+        self._parameter_morph.morph_component.layer = Layer(morph_strip='touch_strip')
+        self._parameter_morph.set_enabled(True)
+
+    def create_track_search_component(self):
+        self._track_search = MaschineTrackSearchEnabler(track_provider=self._track_provider, name='Track_Search_Enabler', is_enabled=False)
+        self._track_search.layer = Layer(track_search_button='track_search_button')
+        self._track_search.track_search_component.layer = Layer(letter_encoder='encoder', select_button='click_button', next_letter_button='right_button',
+                                                                previous_letter_button='left_button', next_match_button='down_button',
+                                                                previous_match_button='up_button')
+        self._track_search.set_enabled(True)
+
     def create_main_modes(self):
         self._main_modes = ModesComponent(name='Main_Modes')
         layer = Layer(bypass_device_button='console_buttons[4]', reset_parameters_button='console_buttons[5]', previous_bank_button='console_buttons[6]',
-                      next_bank_button='console_buttons[7]', randomize_parameters_button='randomize_parameters_button')
+                      next_bank_button='console_buttons[7]', randomize_parameters_button='randomize_parameters_button', randomize_scope_button='randomize_scope_button',
+                      randomize_quantized_button='randomize_quantized_button', randomize_amount_encoder='randomize_amount_encoder')
         device_mode = LayerMode(self._device, layer=layer)
         layer = Layer(parameter_controls='knob_matrix')
         device_parameter_mode = LayerMode(self._device_parameter, layer=layer)
@@ -13,33 +13,43 @@
 #
 from __future__ import absolute_import, print_function, unicode_literals
 
+from contextlib import contextmanager
+
 from ableton.v2.base.dependency import depends
 from ableton.v2.base.event import listens
 from ableton.v2.control_surface.components.device import DeviceComponent
 from ableton.v2.control_surface.parameter_provider import ParameterInfo
-from ableton.v2.base.util import clamp, in_range
+from ableton.v2.base.util import clamp
 from ableton.v2.control_surface.control.button import ButtonControl
-from ableton.v2.base import task
-from functools import partial
-import random
+from ableton.v2.control_surface.control.encoder import StepEncoderControl
+
+from .maschine_parameter_randomizer import MaschineParameterRandomizer
+from .maschine_parameter_snapshots import MaschineParameterSnapshotStore, parameter_values
 
 
 class MaschineDevice(DeviceComponent):
 
-    __events__ = (u'bank',)
+    __events__ = (u'bank', u'bulk_write', u'selected_device')
 
     previous_bank_button = ButtonControl(color='DefaultButton.On', pressed_color='DefaultButton.Off')
     next_bank_button = ButtonControl(color='DefaultButton.On', pressed_color='DefaultButton.Off')
     bypass_device_button = ButtonControl(color='DefaultButton.Off')
     reset_parameters_button = ButtonControl(color='DefaultButton.Off')
     randomize_parameters_button = ButtonControl(color='DefaultButton.Off')
+    randomize_scope_button = ButtonControl(color='DefaultButton.Off', pressed_color='DefaultButton.On')
+    randomize_quantized_button = ButtonControl(color='DefaultButton.Off')
+    randomize_amount_encoder = StepEncoderControl()
 
     @depends(info_display=None)
-    def __init__(self, info_display=None, *a, **k):
+    def __init__(self, info_display=None, banking_info=None, *a, **k):
         assert info_display is not None
         self._info_display = info_display
-        self._quantized_parameters = {}
-        super(MaschineDevice, self).__init__(*a, **k)
+        self._bank_layouts = banking_info
+        self._parameter_snapshots = MaschineParameterSnapshotStore()
+        self._bulk_write_depth = 0
+        self._randomizer = MaschineParameterRandomizer()
+        self._last_randomize_seed = None
+        super(MaschineDevice, self).__init__(banking_info=banking_info, *a, **k)
         self.__on_bank_changed.subject = self._device_bank_registry
         self.update_bank_buttons()
 
@@ -47,6 +57,53 @@ class MaschineDevice(DeviceComponent):
     def device_is_active(self):
         return self.device() and self.device().parameters[0].value != 0
 
+    @property
+    def randomizer(self):
+        return self._randomizer
+
+    @property
+    def last_randomize_seed(self):
+        return self._last_randomize_seed
+
+    @property
+    def is_bulk_writing(self):
+        return self._bulk_write_depth > 0
+
+    @contextmanager
+    def bulk_parameter_write(self, summary=None):
+        """groups parameter writes into a single undo step. bulk_write is notified when the batch
+        starts and when it ends, so listeners can skip per parameter work in between.
+        nested batches join the outer one.
+        Keyword Arguments:
+            summary {string} -- message shown on Maschine MKiii screen 3 when the batch ends (default: {None})
+        """
+        self.begin_bulk_parameter_write()
+        try:
+            yield
+        finally:
+            self.end_bulk_parameter_write(summary)
+
+    def begin_bulk_parameter_write(self):
+        """starts a batch that stays open across ticks, e.g. for a gesture. every call must be
+        matched by end_bulk_parameter_write().
+        """
+        self._bulk_write_depth += 1
+        if self._bulk_write_depth == 1:
+            self.song.begin_undo_step()
+            self.notify_bulk_write()
+
+    def end_bulk_parameter_write(self, summary=None):
+        """ends a batch started with begin_bulk_parameter_write().
+        Keyword Arguments:
+            summary {string} -- message shown on Maschine MKiii screen 3 when the batch ends (default: {None})
+        """
+        self._bulk_write_depth -= 1
+        if self._bulk_write_depth == 0:
+            self.song.end_undo_step()
+            self.notify_bulk_write()
+            if summary:
+                self._display_temprary_message_on_maschine(summary, 3)
+
     @listens('is_active')
     def __on_is_active_changed(self):
         self.update_bypass_button()
@@ -54,6 +111,11 @@ class MaschineDevice(DeviceComponent):
             message = '{} - {}'.format('Activated' if self.device_is_active else 'Bypassed', self.device().name)
             self._display_temprary_message_on_maschine(message, 1)
 
+    @listens('parameters')
+    def __on_parameters_changed(self):
+        if self._bank_layouts is not None:
+            self._bank_layouts.invalidate(self.__on_parameters_changed.subject)
+
     @listens('device_bank')
     def __on_bank_changed(self, device, bank):
         if device == self.device():
@@ -77,6 +139,15 @@ class MaschineDevice(DeviceComponent):
     def set_randomize_parameters_button(self, button):
         self.randomize_parameters_button.set_control_element(button)
 
+    def set_randomize_scope_button(self, button):
+        self.randomize_scope_button.set_control_element(button)
+
+    def set_randomize_quantized_button(self, button):
+        self.randomize_quantized_button.set_control_element(button)
+
+    def set_randomize_amount_encoder(self, encoder):
+        self.randomize_amount_encoder.set_control_element(encoder)
+
     @previous_bank_button.pressed
     def _on_previous_bank_button_pressed(self, button):
         self.select_previous_bank()
@@ -98,6 +169,22 @@ class MaschineDevice(DeviceComponent):
     def _on_randomize_parameters_button_pressed(self, button):
         self.randomize_device_parameters()
 
+    @randomize_scope_button.pressed
+    def _on_randomize_scope_button_pressed(self, button):
+        self._randomizer.cycle_scope()
+        self._display_randomizer_settings()
+
+    @randomize_quantized_button.pressed
+    def _on_randomize_quantized_button_pressed(self, button):
+        self._randomizer.toggle_quantized()
+        self.update_randomize_quantized_button()
+        self._display_randomizer_settings()
+
+    @randomize_amount_encoder.value
+    def randomize_amount_encoder(self, value, encoder):
+        self._randomizer.change_amount(1 if value > 0 else -1)
+        self._display_randomizer_settings()
+
     def select_previous_bank(self):
         self._scroll_banks(-1)
 
@@ -110,29 +197,48 @@ class MaschineDevice(DeviceComponent):
             if parameter.is_enabled:
                 self.device().parameters[0].value = False if self.device_is_active else True
 
+    def capture_parameter_values(self):
+        """returns the current parameter values of the selected device, or None when no device is selected"""
+        device = self.device()
+        return parameter_values(device) if device is not None else None
+
     def reset_device_parameters(self):
-        if self.device() is None:
+        """sets continuous parameters to their default values, and quantized parameters
+        to the values they had when the device was first selected.
+        """
+        device = self.device()
+        if device is None:
+            return
+        snapshot = self._parameter_snapshots.snapshot(device)
+        with self.bulk_parameter_write('Reset - {}'.format(device.name)):
+            for index, p in enumerate(device.parameters):
+                if not p.is_enabled or p.state != 0:
+                    continue
+                if not p.is_quantized:
+                    p.value = p.default_value
+                elif snapshot is not None and index < len(snapshot):
+                    p.value = snapshot[index]
+
+    def randomize_device_parameters(self, seed=None):
+        """writes random values to the parameters in the randomizer scope as one batch.
+        the seed is shown on Maschine MKiii screen 3 and kept in last_randomize_seed.
+        Keyword Arguments:
+            seed {int} -- generator seed, a new one is drawn when None (default: {None})
+        """
+        device = self.device()
+        if device is None:
             return
-        parameters = filter(lambda param: param.is_enabled and param.state == 0, self.device().parameters)
-        for i in range(0, len(parameters)):
-            p = parameters[i]
-            if not p.is_quantized:
-                p.value = p.default_value
-            else:
-                if p.name in self._quantized_parameters:
-                    p.value = self._quantized_parameters[p.name]
-        # self._display_temprary_message_on_maschine('Device Reset to defaults', 3)
-
-    def randomize_device_parameters(self):
-        if self.device() is None:
+        bank_parameters = [info.parameter for info in self.parameters]
+        parameters = self._randomizer.target_parameters(device, bank_parameters)
+        if not parameters:
+            self._display_temprary_message_on_maschine('Nothing to Randomize - {}'.format(self._randomizer.scope), 3)
             return
-        parameters = filter(lambda param:  param.is_enabled and param.state == 0, self.device().parameters[1:])
-        for p in parameters:
-            if not p.is_quantized:
-                value = random.random()
-                scaled_value = p.min + (value * (p.max - p.min))
-                if in_range(scaled_value, p.min, p.max):
-                    p.value = scaled_value
+        seed = self._randomizer.new_seed() if seed is None else seed
+        values = self._randomizer.values(parameters, seed)
+        self._last_randomize_seed = seed
+        with self.bulk_parameter_write('Randomized {} - Seed {}'.format(self._randomizer.settings_text, seed)):
+            for parameter, value in zip(parameters, values):
+                parameter.value = value
 
     def _scroll_banks(self, offset):
         if self._bank:
@@ -144,39 +250,50 @@ class MaschineDevice(DeviceComponent):
         self.bypass_device_button.enabled = self.device() is not None
         self.bypass_device_button.color = 'DefaultButton.Off' if self.device_is_active else 'DefaultButton.On'
 
+    def update_randomize_quantized_button(self):
+        self.randomize_quantized_button.color = 'DefaultButton.On' if self._randomizer.include_quantized else 'DefaultButton.Off'
+
     def update_bank_buttons(self):
         self.previous_bank_button.enabled = self._bank is not None and self._bank.index > 0
         self.next_bank_button.enabled = self._bank is not None and self._bank.index + 1 < self._bank.bank_count()
 
     def _set_device(self, device):
+        self.__on_parameters_changed.subject = device
         super(MaschineDevice, self)._set_device(device)
         self.__on_is_active_changed.subject = device
         self.update_bank_buttons()
         self.update_bypass_button()
         if device:
-            self._collect_device_quantized_parameters(device)
+            self._parameter_snapshots.capture(device)
             self._display_message_on_maschine()
-
-    def _collect_device_quantized_parameters(self, device):
-        if not device.can_have_chains:
-            parameters = device.parameters
-            for parameter in parameters:
-                if parameter.is_enabled and parameter.is_quantized:
-                    self._quantized_parameters[parameter.name] = parameter.value
+        self.notify_selected_device()
+
+    def _current_bank_details(self):
+        device = self.device()
+        if self._bank_layouts is None or device is None or self._bank is None:
+            return super(MaschineDevice, self)._current_bank_details()
+        bank_index = self._bank.index
+        details = self._bank_layouts.bank_parameters(device, bank_index)
+        if details is None:
+            bank_name, parameters = super(MaschineDevice, self)._current_bank_details()
+            parameters = list(parameters)
+            self._bank_layouts.store_bank_parameters(device, bank_index, bank_name, parameters)
+            return bank_name, parameters
+        bank_name, indexed_names = details
+        device_parameters = device.parameters
+        return bank_name, [(device_parameters[index] if index is not None else None, name) for index, name in indexed_names]
 
     def _create_parameter_info(self, parameter, name):
         parameter_info = ParameterInfo(parameter=parameter, name=name, default_encoder_sensitivity=1.0, fine_grain_encoder_sensitivity=0.1)
         return parameter_info
 
     def _display_temprary_message_on_maschine(self, message, display_index):
-        self._tasks.clear()
-        self._info_display.clear_display(display_index)
-        temp_display = partial(self._info_display.display_message_on_maschine, message, display_index)
-        clear_display = partial(self._info_display.clear_display, display_index)
-        self._tasks.add(task.sequence(task.run(temp_display), task.wait(2.5), task.run(clear_display), task.run(self._display_message_on_maschine)))
+        self._info_display.display_temporary_message_on_maschine(message, display_index, 2.5, owner=self)
+
+    def _display_randomizer_settings(self):
+        self._display_temprary_message_on_maschine('Randomize {}'.format(self._randomizer.settings_text), 3)
 
     def _display_message_on_maschine(self):
         if self.device():
-            self._info_display.clear_display(1)
             message = '{} - {}'.format(self.device().name or '', self._bank.name or '')
             self._info_display.display_message_on_maschine(message, 1)
@@ -13,43 +13,111 @@
 #
 from __future__ import absolute_import, print_function, unicode_literals
 
+import Live  # noqa
+from ableton.v2.base import task
 from ableton.v2.base.dependency import depends
 from ableton.v2.base.event import listens, listens_group
 from ableton.v2.control_surface.components import DisplayingDeviceParameterComponent
 
+AutomationState = Live.DeviceParameter.AutomationState
+
+RENDER_INTERVAL = 1.0 / 30
+TOUCH_TIMEOUT = 0.5
+PARAMETER_SCREEN = 3
+PARAMETER_LAYOUT = (('name', 0, 15), ('value', 16, 12))
+
 
 class MaschineDeviceParameter(DisplayingDeviceParameterComponent):
+    """
+    shows the name and value of the parameter being changed on Maschine MKiii screen 3 and Live status bar.
+
+    in throttled mode a value change only marks its parameter as dirty, and the last dirty parameter
+    is rendered at most once per render interval. changes coming from automation playback are ignored
+    unless one of the console knobs is being turned.
+
+    on Maschine MKiii the parameter name and value are separate fields of screen 3, so a value change
+    only rewrites the value field.
+
+    while the parameter provider writes parameters in bulk (reset, randomize) value changes are not
+    rendered at all. the parameter values are updated once when the batch ends.
+    """
 
     # todo: this should eventually display parameter names when knobs get touched in device mode
 
     @depends(info_display=None)
-    def __init__(self, info_display=None, parameter_provider=None,  *a, **k):
+    def __init__(self, info_display=None, parameter_provider=None, throttle_rendering=True, render_interval=RENDER_INTERVAL, *a, **k):
         assert info_display is not None
         self._info_display = info_display
+        self._throttle_rendering = throttle_rendering
+        self._dirty_parameter = None
+        self._knobs_touched = False
+        self._bulk_writing = False
         super(MaschineDeviceParameter, self).__init__(parameter_provider=parameter_provider, *a, **k)
+        self._render_task = self._tasks.add(task.sequence(task.wait(render_interval), task.run(self._render_dirty_parameter)))
+        self._render_task.kill()
+        self._touch_task = self._tasks.add(task.sequence(task.wait(TOUCH_TIMEOUT), task.run(self._release_knobs)))
+        self._touch_task.kill()
+        self._info_display.set_screen_layout(PARAMETER_SCREEN, PARAMETER_LAYOUT)
         self.__on_selected_parameter_changed.subject = self.song.view
+        self.__on_bulk_write.subject = parameter_provider
+
+    def set_parameter_controls(self, encoders):
+        super(MaschineDeviceParameter, self).set_parameter_controls(encoders)
+        self.__on_parameter_control_value.replace_subjects(encoders or [])
 
     @listens_group('value')
     def _on_parameter_value_changed(self, parameter):
-        self._update_parameter_values()
-        self.display_parameter_info(parameter)
+        if self._bulk_writing:
+            return
+        if not self._throttle_rendering:
+            self._update_parameter_values()
+            self.display_parameter_info(parameter)
+        elif self._knobs_touched or parameter.automation_state != AutomationState.playing:
+            self._dirty_parameter = parameter
+            if not self._render_task.is_running:
+                self._render_task.restart()
+
+    @listens_group('value')
+    def __on_parameter_control_value(self, value, encoder):
+        self._knobs_touched = True
+        self._touch_task.restart()
+
+    @listens('bulk_write')
+    def __on_bulk_write(self):
+        self._bulk_writing = self.__on_bulk_write.subject.is_bulk_writing
+        if self._bulk_writing:
+            self._dirty_parameter = None
+            self._render_task.kill()
+        else:
+            self._update_parameter_values()
+
+    def _release_knobs(self):
+        self._knobs_touched = False
+
+    def _render_dirty_parameter(self):
+        parameter = self._dirty_parameter
+        self._dirty_parameter = None
+        if parameter is not None:
+            self._update_parameter_values()
+            self.display_parameter_info(parameter)
 
     def display_parameter_info(self, parameter):
-        message = self._create_formatted_message(parameter)
-        self._info_display.display_message_on_maschine(message, 3)
-        self._info_display.display_message_on_ableton(message)
+        formatted_value = self._create_formatted_value(parameter)
+        self._info_display.display_field_on_maschine(parameter.name, PARAMETER_SCREEN, 'name')
+        self._info_display.display_field_on_maschine(formatted_value, PARAMETER_SCREEN, 'value')
+        self._info_display.display_message_on_ableton('{}: {}'.format(parameter.name, formatted_value))
 
-    def _create_formatted_message(self, parameter):
+    def _create_formatted_value(self, parameter):
         value = parameter.value
         formatted_value = parameter.str_for_value(value) if hasattr(parameter, 'str_for_value') else (value/parameter.max*100)
-        message = '{}: {}'.format(parameter.name, formatted_value)
-        return message
+        return '{}'.format(formatted_value)
 
     @listens('selected_parameter')
     def __on_selected_parameter_changed(self):
         parameter = self.song.view.selected_parameter
         if parameter is not None:
             self._info_display.display_message_on_ableton('{}'.format(parameter.name))
-            self._info_display.display_message_on_maschine('{}'.format(parameter.name), 3)
+            self._info_display.display_field_on_maschine('{}'.format(parameter.name), PARAMETER_SCREEN, 'name')
+            self._info_display.display_field_on_maschine('', PARAMETER_SCREEN, 'value')
         else:
-            self._info_display.clear_display(3)
+            self._info_display.clear_display(PARAMETER_SCREEN)
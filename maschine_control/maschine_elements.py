@@ -26,17 +26,81 @@ from ableton.v2.control_surface.resource import PrioritizedResource
 DEFAULT_CHANNEL = 15
 RELATIVE_SMOOTH = Live.MidiMap.MapMode.relative_smooth_two_compliment
 ABSOLUTE = Live.MidiMap.MapMode.absolute
+LED_MESSAGE_LENGTH = 3
+
+
+class MaschineLedState(object):
+    """
+    the led values Maschine MKiii currently shows, keyed by midi message type, physical channel and identifier.
+    it is shared by all led capable elements, so a value is sent only when it differs from what the
+    controller already shows, whichever element or component sent the previous one.
+    invalidate() forgets everything, so the next value of every led is sent again (e.g. on reconnection).
+    """
+
+    def __init__(self, *a, **k):
+        super(MaschineLedState, self).__init__(*a, **k)
+        self._values = {}
+
+    def update(self, address, value):
+        """stores the value of an led.
+        returns False if the led already shows the value and the message can be dropped.
+        Arguments:
+            address {tuple} -- (message type, channel, identifier) of the led
+            value {int} -- the resolved led value
+        """
+        if self._values.get(address) == value:
+            return False
+        self._values[address] = value
+        return True
+
+    def forget(self, address):
+        self._values.pop(address, None)
+
+    def invalidate(self):
+        self._values.clear()
+
+
+class MaschineButtonElement(ButtonElement):
+    """
+    a button element that sends led values through the shared led state and reports every
+    led message it sends, or drops, to the traffic monitor.
+    """
+
+    @depends(traffic_monitor=None, led_state=None)
+    def __init__(self, traffic_monitor=None, led_state=None, *a, **k):
+        super(MaschineButtonElement, self).__init__(*a, **k)
+        self._traffic_monitor = traffic_monitor
+        self._led_state = led_state
+
+    def send_value(self, value, force=False, channel=None):
+        if force and self._led_state is not None:
+            self._led_state.forget(self._led_address(channel))
+        super(MaschineButtonElement, self).send_value(value, force=force, channel=channel)
+
+    def _led_address(self, channel=None):
+        # leds are addressed by the physical channel and identifier _do_send_value() writes to,
+        # not by the translated ones message_channel() and message_identifier() return.
+        return (self.message_type(), self._original_channel if channel is None else channel, self._original_identifier)
+
+    def _do_send_value(self, value, channel=None):
+        if self._led_state is not None and not self._led_state.update(self._led_address(channel), value):
+            if self._traffic_monitor is not None:
+                self._traffic_monitor.record_suppressed_led_message()
+            return
+        super(MaschineButtonElement, self)._do_send_value(value, channel)
+        if self._traffic_monitor is not None:
+            self._traffic_monitor.record_led_message(LED_MESSAGE_LENGTH)
 
 
 @depends(skin=None)
 def create_button(name, identifier, skin=None, **k):
-    button = ButtonElement(is_momentary=True, msg_type=MIDI_CC_TYPE, channel=DEFAULT_CHANNEL, identifier=identifier, skin=skin, name=name, **k)
+    button = MaschineButtonElement(is_momentary=True, msg_type=MIDI_CC_TYPE, channel=DEFAULT_CHANNEL, identifier=identifier, skin=skin, name=name, **k)
     return button
 
 
 @depends(skin=None)
 def create_pad(name, identifier, skin=None, **k):
-    button = ButtonElement(is_momentary=True, msg_type=MIDI_NOTE_TYPE, channel=DEFAULT_CHANNEL, identifier=identifier, skin=skin, name=name, **k)
+    button = MaschineButtonElement(is_momentary=True, msg_type=MIDI_NOTE_TYPE, channel=DEFAULT_CHANNEL, identifier=identifier, skin=skin, name=name, **k)
     return button
 
 
@@ -109,6 +173,8 @@ class MaschineElements(object):
 
         self.next_key_button = with_shift('Next_Key', self.keyboard_button)
         self.previous_key_button = with_shift('Previous_Key', self.pad_mode_button)
+        self.parent_group_button = with_shift('Parent_Group', self.chords_button)
+        self.track_hierarchy_button = with_shift('Track_Hierarchy', self.step_button)
 
         # console section controls
         self.console_buttons = [create_button('Console_{}'.format(index + 1), index + 22) for index in xrange(8)]
@@ -119,6 +185,7 @@ class MaschineElements(object):
         self.return_track_button = with_shift('New_Return', self.console_buttons[0])
         self.audio_track_button = with_shift('New_Audio', self.console_buttons[1])
         self.midi_track_button = with_shift('New_Midi', self.console_buttons[2])
+        self.capture_morph_b_button = with_shift('Capture_Morph_B', self.console_buttons[3])
 
         self.console_knobs = [create_knob('Knob_{}'.format(index + 1), index + 70) for index in xrange(8)]
         self.knob_matrix = create_matrix(name='Knob_Matrix', controls=self.console_knobs)
@@ -144,3 +211,10 @@ class MaschineElements(object):
 
         self.next_device_page_button = with_shift('Next_Device_Page', self.right_button)
         self.previous_device_page_button = with_shift('Previous_Device_Page', self.left_button)
+        self.track_search_button = with_shift('Track_Search', self.click_button)
+        self.randomize_amount_encoder = with_shift('Randomize_Amount', self.encoder)
+        self.randomize_scope_button = with_shift('Randomize_Scope', self.down_button)
+        self.randomize_quantized_button = with_shift('Randomize_Quantized', self.up_button)
+
+        # diagnostics
+        self.traffic_report_button = with_shift('Traffic_Report', self.duplicate_button)
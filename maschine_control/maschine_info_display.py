@@ -14,7 +14,115 @@
 from __future__ import absolute_import, print_function, unicode_literals
 
 
-from ableton.v2.base import depends
+import sys
+import unicodedata
+from collections import OrderedDict
+
+from ableton.v2.base import depends, task
+
+NUM_SCREENS = 4
+SCREEN_WIDTH = 28
+SYSEX_HEADER = (240, 0, 0, 102, 23, 18)
+SYSEX_END = 247
+DEFAULT_OVERLAY_DURATION = 1.5
+MARQUEE_STEP_TIME = 0.3
+MARQUEE_HOLD_STEPS = 4
+MARQUEE_GAP = '   '
+FRAME_CACHE_SIZE = 64
+STATUS_BAR_INTERVAL = 0.25
+DISPLAY_ORIGIN = 'Info_Display'
+HEADER_LENGTH = len(SYSEX_HEADER) + 1
+
+SPECIAL_TRANSLITERATIONS = {
+    '\u00df': 'ss', '\u00e6': 'ae', '\u00c6': 'AE', '\u0153': 'oe', '\u0152': 'OE', '\u00f8': 'o', '\u00d8': 'O',
+    '\u0142': 'l', '\u0141': 'L', '\u0111': 'd', '\u0110': 'D', '\u00f0': 'd', '\u00d0': 'D', '\u00fe': 'th',
+    '\u00de': 'TH', '\u0131': 'i', '\u00d7': 'x', '\u00f7': '/', '\u2018': "'", '\u2019': "'", '\u201c': '"',
+    '\u201d': '"', '\u2013': '-', '\u2014': '-', '\u2022': '*', '\u266d': 'b', '\u266f': '#',
+}
+
+
+def _build_transliteration_table():
+    """maps latin and punctuation code points to their closest 7-bit ascii spelling"""
+    table = {}
+    for code_point in list(range(0x80, 0x250)) + list(range(0x2000, 0x2070)):
+        decomposed = unicodedata.normalize('NFKD', unichr(code_point))
+        ascii_text = ''.join(c for c in decomposed if ord(c) < 128)
+        if ascii_text:
+            table[code_point] = ascii_text
+    for char, ascii_text in SPECIAL_TRANSLITERATIONS.items():
+        table[ord(char)] = ascii_text
+    return table
+
+
+TRANSLITERATION_TABLE = _build_transliteration_table()
+
+
+class ScreenOverlay(object):
+    """a temporary message shown on top of a screen base text until it expires.
+    an overlay without expires_at stays until its owner removes it.
+    """
+
+    def __init__(self, text='', expires_at=0.0, owner=None, *a, **k):
+        super(ScreenOverlay, self).__init__(*a, **k)
+        self.text = text
+        self.expires_at = expires_at
+        self.owner = owner
+
+    def is_expired(self, time):
+        return self.expires_at is not None and self.expires_at <= time
+
+
+class MaschineSysexEncoder(object):
+    """
+    turns screen lines into sysex frames that are safe to send to Maschine MKiii.
+    text is transliterated to 7-bit ascii, anything without an ascii spelling becomes '?'.
+    the most recently used frames are kept, so repeated lines are sent without encoding them again.
+    """
+
+    def __init__(self, cache_size=FRAME_CACHE_SIZE, *a, **k):
+        super(MaschineSysexEncoder, self).__init__(*a, **k)
+        self._cache_size = cache_size
+        self._frames = OrderedDict()
+        self._template = bytearray(SYSEX_HEADER + (0,) + (32,) * SCREEN_WIDTH + (SYSEX_END,))
+
+    def transliterate(self, text_message):
+        try:
+            text_message.encode('ascii')
+            return text_message
+        except UnicodeError:
+            transliterated = text_message.translate(TRANSLITERATION_TABLE)
+            return transliterated.encode('ascii', 'replace').decode('ascii')
+
+    def frame_for(self, text_line, display_index):
+        """returns the full sysex frame of a screen line
+        Arguments:
+            text_line {string} -- transliterated text, already fitted to the screen width
+            display_index {int} -- which screen to display the line
+        Returns:
+            tuple -- sysex message ready to be sent to MaschineMKiii screens
+        """
+        key = (text_line, display_index)
+        frame = self._frames.pop(key, None)
+        if frame is None:
+            frame = self._encode(text_line, display_index)
+            if len(self._frames) >= self._cache_size:
+                self._frames.popitem(last=False)
+        self._frames[key] = frame
+        return frame
+
+    def span_for(self, text_line, display_index, start, end):
+        """returns a sysex frame that updates only the characters from start to end of a screen line"""
+        frame = self.frame_for(text_line, display_index)
+        if start == 0 and end == SCREEN_WIDTH:
+            return frame
+        header = SYSEX_HEADER + (frame[HEADER_LENGTH - 1] + start,)
+        return header + frame[HEADER_LENGTH + start:HEADER_LENGTH + end] + (SYSEX_END,)
+
+    def _encode(self, text_line, display_index):
+        frame = bytearray(self._template)
+        frame[HEADER_LENGTH - 1] = display_index * SCREEN_WIDTH
+        frame[HEADER_LENGTH:HEADER_LENGTH + SCREEN_WIDTH] = text_line.encode('ascii')
+        return tuple(frame)
 
 
 class MaschineInfoDisplay(object):
@@ -24,61 +132,343 @@ class MaschineInfoDisplay(object):
         - display messages on Ableton status bar (Yellow bar)
         - display messages on Maschine MKiii screens
         - clear data displays on Maschine MKiii screens
+
+    a shadow copy of the 4 screens is kept, so only the characters that actually changed
+    are sent to Maschine MKiii. writing the same text twice sends nothing.
+
+    writes to Maschine MKiii screens are queued and flushed once per control surface tick.
+    only the last text written to a screen during a tick is sent.
+
+    every screen is a stack: a persistent base text, plus temporary overlays on top of it.
+    overlays expire on a single shared clock, and the base text comes back by itself.
+
+    text longer than a screen scrolls as a marquee on the same clock. scrolling stops as soon
+    as the screen shows something else.
+
+    non-ascii characters are transliterated before they reach Maschine MKiii (see MaschineSysexEncoder).
+
+    Live status bar messages are rate limited: a message identical to the one shown is dropped, and
+    messages arriving faster than the status bar interval wait for the clock. the latest one always wins.
+
+    a screen can declare a layout of named fields with fixed offsets and widths. updating a single
+    field leaves the rest of the screen alone, so only that field's characters are sent.
+
+    when a traffic monitor is injected, every frame sent or suppressed is counted. the component that
+    wrote a frame is looked up only while the monitor records origins.
     """
-    @depends(show_message=None, send_midi=None)
-    def __init__(self, show_message=None, send_midi=None, *a, **k):
+    @depends(show_message=None, send_midi=None, parent_task_group=None, traffic_monitor=None)
+    def __init__(self, show_message=None, send_midi=None, parent_task_group=None, traffic_monitor=None, marquee_enabled=True,
+                 status_bar_interval=STATUS_BAR_INTERVAL, *a, **k):
         """Keyword Arguments:
             show_message {function} -- shows messages on Ableton Live's status bar. value will be injected
             by the control surface. (default: {None})
 
             send_midi {function} -- sends midi messages to Maschine MKiii. value will be injected
             by the control surface. (default: {None})
+
+            parent_task_group {TaskGroup} -- the control surface task group that runs the display clock.
+            value will be injected by the control surface. (default: {None})
+
+            traffic_monitor {MaschineTrafficMonitor} -- counts the display traffic. value will be injected
+            by the control surface. (default: {None})
+
+            marquee_enabled {bool} -- scroll text that does not fit on a screen instead of cutting it. (default: {True})
+
+            status_bar_interval {float} -- minimum seconds between two Live status bar updates. (default: {STATUS_BAR_INTERVAL})
         """
         assert show_message is not None and callable(show_message)
         assert send_midi is not None and callable(send_midi)
+        assert parent_task_group is not None
         super(MaschineInfoDisplay, self).__init__(*a, **k)
         self._show_message = show_message
         self._send_midi = send_midi
+        self._traffic_monitor = traffic_monitor
+        self._encoder = MaschineSysexEncoder()
+        self._shadow_buffer = [None] * NUM_SCREENS
+        self._pending = [None] * NUM_SCREENS
+        self._pending_origins = [None] * NUM_SCREENS
+        self._base_texts = [''] * NUM_SCREENS
+        self._overlays = [[] for _ in range(NUM_SCREENS)]
+        self._layouts = [None] * NUM_SCREENS
+        self._field_texts = [{} for _ in range(NUM_SCREENS)]
+        self._time = 0.0
+        self._marquee_enabled = marquee_enabled
+        self._marquee_texts = [None] * NUM_SCREENS
+        self._marquee_positions = [0] * NUM_SCREENS
+        self._marquee_elapsed = 0.0
+        self._status_bar_interval = status_bar_interval
+        self._shown_status_message = None
+        self._pending_status_message = None
+        self._status_message_time = None
+        self._clock_task = parent_task_group.add(task.FuncTask(self._on_clock_tick))
+        self._clock_task.kill()
+
+    @property
+    def marquee_enabled(self):
+        return self._marquee_enabled
+
+    @marquee_enabled.setter
+    def marquee_enabled(self, enabled):
+        self._marquee_enabled = enabled
+        for display_index in range(0, NUM_SCREENS):
+            self._render(display_index)
 
     def display_message_on_ableton(self, message):
         """displays a message on Live status bar.
         Arguments:
             message {string} -- the message to display on Live status bar
         """
-        self._show_message(message)
+        if message == self._shown_status_message:
+            self._drop_pending_status_message()
+            self._record_status_message(suppressed=True)
+        elif self._is_status_bar_open():
+            self._drop_pending_status_message()
+            self._show_status_message(message)
+        else:
+            self._drop_pending_status_message()
+            self._pending_status_message = message
+            self._start_clock()
 
     def display_message_on_maschine(self, message, screen_index):
-        """displays a message on Maschine MKiii screens.
+        """sets the base text of a Maschine MKiii screen.
         Arguments:
             message {string} -- message to display on Maschine MKiii screens~
             screen_index {int} -- screen index 0 through 3
         """
-        self._send_to_display(message, screen_index)
+        screen_index = min(screen_index, NUM_SCREENS - 1)
+        self._field_texts[screen_index] = {}
+        self._base_texts[screen_index] = message
+        self._render(screen_index, self._origin_of_call())
+
+    def set_screen_layout(self, screen_index, fields):
+        """declares the fields of a screen.
+        Arguments:
+            screen_index {int} -- screen index 0 through 3
+            fields {sequence} -- (name, offset, width) of every field, e.g. (('name', 0, 16), ('value', 16, 12)).
+            None removes the layout.
+        """
+        screen_index = min(screen_index, NUM_SCREENS - 1)
+        if fields is not None:
+            assert all(0 <= offset and offset + width <= SCREEN_WIDTH for _, offset, width in fields)
+            fields = tuple(fields)
+        self._layouts[screen_index] = fields
+        self._field_texts[screen_index] = {}
+
+    def display_field_on_maschine(self, message, screen_index, field_name):
+        """updates one field of a screen layout and keeps the other fields as they are.
+        Arguments:
+            message {string} -- text of the field, cut to the field width
+            screen_index {int} -- screen index 0 through 3
+            field_name {string} -- a field declared with set_screen_layout
+        """
+        screen_index = min(screen_index, NUM_SCREENS - 1)
+        layout = self._layouts[screen_index]
+        assert layout is not None and any(name == field_name for name, _, _ in layout)
+        field_texts = self._field_texts[screen_index]
+        field_texts[field_name] = self._encoder.transliterate(message)
+        line = [' '] * SCREEN_WIDTH
+        for name, offset, width in layout:
+            text_message = field_texts.get(name, '')[:width]
+            line[offset:offset + len(text_message)] = text_message
+        self._base_texts[screen_index] = ''.join(line).rstrip()
+        self._render(screen_index, self._origin_of_call())
+
+    def display_temporary_message_on_maschine(self, message, screen_index, duration=DEFAULT_OVERLAY_DURATION, owner=None):
+        """shows a message on top of a screen base text for a limited time.
+        Arguments:
+            message {string} -- message to display on Maschine MKiii screens
+            screen_index {int} -- screen index 0 through 3
+        Keyword Arguments:
+            duration {float} -- seconds before the message expires, None keeps it until remove_temporary_messages()
+            is called for its owner (default: {DEFAULT_OVERLAY_DURATION})
+            owner {object} -- a new message replaces the previous message of the same owner on that screen.
+            messages without an owner stack on top of each other. (default: {None})
+        """
+        screen_index = min(screen_index, NUM_SCREENS - 1)
+        overlays = self._overlays[screen_index]
+        if owner is not None:
+            overlays[:] = [overlay for overlay in overlays if overlay.owner is not owner]
+        expires_at = self._time + duration if duration is not None else None
+        overlays.append(ScreenOverlay(text=message, expires_at=expires_at, owner=owner))
+        self._render(screen_index, self._origin_of_call())
+
+    def remove_temporary_messages(self, owner):
+        """removes the temporary messages of an owner from all screens before they expire.
+        Arguments:
+            owner {object} -- the owner given to display_temporary_message_on_maschine
+        """
+        for display_index in range(0, NUM_SCREENS):
+            overlays = self._overlays[display_index]
+            if any(overlay.owner is owner for overlay in overlays):
+                overlays[:] = [overlay for overlay in overlays if overlay.owner is not owner]
+                self._render(display_index, self._origin_of_call())
 
     def clear_all_displays(self):
-        for display_index in range(0, 4):
+        for display_index in range(0, NUM_SCREENS):
+            self._overlays[display_index] = []
             self.clear_display(display_index)
 
     def clear_display(self, display_index):
-        self._send_to_display('', display_index)
+        """clears the base text of a screen. temporary messages on that screen are kept until they expire."""
+        self.display_message_on_maschine('', display_index)
+
+    def flush(self):
+        """sends the last queued text of every screen to Maschine MKiii.
+        this runs automatically once per tick, call it directly only when the queue must be emptied right away.
+        """
+        for display_index, text_message in enumerate(self._pending):
+            if text_message is not None:
+                self._pending[display_index] = None
+                self._send_to_display(text_message, display_index, self._pending_origins[display_index])
 
-    def _send_to_display(self, text_message, display_index=0):
-        sysex_message = self._make_sysex_message(text_message, display_index)
-        self._send_midi(tuple(sysex_message))
+    def invalidate(self):
+        """forgets what the screens are showing and sends the current text of every screen again as a full frame.
+        use this when Maschine MKiii lost its display state (e.g. after a reconnection).
+        """
+        self._shadow_buffer = [None] * NUM_SCREENS
+        for display_index in range(0, NUM_SCREENS):
+            self._render(display_index)
+
+    def _origin_of_call(self):
+        """returns the name of the first caller outside of this object, when the traffic monitor records origins"""
+        if self._traffic_monitor is None or not self._traffic_monitor.records_origins:
+            return None
+        frame = sys._getframe(1)
+        while frame is not None:
+            caller = frame.f_locals.get('self')
+            if caller is not self:
+                if caller is None:
+                    return frame.f_code.co_name
+                return getattr(caller, 'name', None) or type(caller).__name__
+            frame = frame.f_back
+        return None
+
+    def _render(self, display_index, origin=DISPLAY_ORIGIN):
+        overlays = self._overlays[display_index]
+        text_message = overlays[-1].text if overlays else self._base_texts[display_index]
+        text_message = self._encoder.transliterate(text_message)
+        if self._marquee_enabled and len(text_message) > SCREEN_WIDTH:
+            if text_message != self._marquee_texts[display_index]:
+                self._marquee_texts[display_index] = text_message
+                self._marquee_positions[display_index] = -MARQUEE_HOLD_STEPS
+            text_message = self._marquee_window(display_index)
+        else:
+            self._marquee_texts[display_index] = None
+        self._queue(text_message, display_index, origin)
+
+    def _marquee_window(self, display_index):
+        text_message = self._marquee_texts[display_index]
+        position = max(0, self._marquee_positions[display_index])
+        looped = text_message + MARQUEE_GAP + text_message
+        return looped[position:position + SCREEN_WIDTH]
+
+    def _step_marquees(self, delta):
+        if not any(self._marquee_texts):
+            self._marquee_elapsed = 0.0
+            return
+        self._marquee_elapsed += delta
+        while self._marquee_elapsed >= MARQUEE_STEP_TIME:
+            self._marquee_elapsed -= MARQUEE_STEP_TIME
+            for display_index, text_message in enumerate(self._marquee_texts):
+                if text_message is not None:
+                    position = self._marquee_positions[display_index] + 1
+                    if position >= len(text_message) + len(MARQUEE_GAP):
+                        position = -MARQUEE_HOLD_STEPS
+                    self._marquee_positions[display_index] = position
+                    self._queue(self._marquee_window(display_index), display_index)
+
+    def _queue(self, text_message, display_index, origin=DISPLAY_ORIGIN):
+        if self._traffic_monitor is not None and self._pending[display_index] is not None:
+            self._traffic_monitor.record_coalesced_write(display_index)
+        self._pending[display_index] = text_message
+        self._pending_origins[display_index] = origin
+        self._start_clock()
+
+    def _start_clock(self):
+        if not self._clock_task.is_running:
+            self._clock_task.restart()
+
+    def _is_status_bar_open(self):
+        return self._status_message_time is None or self._time - self._status_message_time >= self._status_bar_interval
+
+    def _show_status_message(self, message):
+        self._shown_status_message = message
+        self._status_message_time = self._time
+        self._show_message(message)
+        self._record_status_message(suppressed=False)
+        self._start_clock()
 
-    def _make_sysex_message(self, text_message, display_index):
-        """creates a proper sysex message
+    def _drop_pending_status_message(self):
+        if self._pending_status_message is not None:
+            self._pending_status_message = None
+            self._record_status_message(suppressed=True)
+
+    def _record_status_message(self, suppressed):
+        if self._traffic_monitor is not None:
+            self._traffic_monitor.record_status_message(suppressed)
+
+    def _flush_status_bar(self):
+        if self._pending_status_message is not None and self._is_status_bar_open():
+            message = self._pending_status_message
+            self._pending_status_message = None
+            self._show_status_message(message)
+
+    def _on_clock_tick(self, delta):
+        self._time += delta
+        self._expire_overlays()
+        self._step_marquees(delta)
+        self._flush_status_bar()
+        self.flush()
+        return self._is_clock_needed()
+
+    def _expire_overlays(self):
+        for display_index, overlays in enumerate(self._overlays):
+            if any(overlay.is_expired(self._time) for overlay in overlays):
+                overlays[:] = [overlay for overlay in overlays if not overlay.is_expired(self._time)]
+                self._render(display_index)
+
+    def _is_clock_needed(self):
+        has_expiring_overlays = any(overlay.expires_at is not None for overlays in self._overlays for overlay in overlays)
+        return has_expiring_overlays or any(self._marquee_texts) or any(text is not None for text in self._pending) or not self._is_status_bar_open()
+
+    def _send_to_display(self, text_message, display_index=0, origin=DISPLAY_ORIGIN):
+        display_index = min(display_index, NUM_SCREENS - 1)
+        text = self._fit_to_screen(text_message)
+        shown = self._shadow_buffer[display_index]
+        if shown is None:
+            start, end = 0, SCREEN_WIDTH
+        else:
+            span = self._changed_span(shown, text)
+            if span is None:
+                if self._traffic_monitor is not None:
+                    self._traffic_monitor.record_suppressed_frame(display_index)
+                return
+            start, end = span
+        self._shadow_buffer[display_index] = text
+        sysex_message = self._encoder.span_for(text, display_index, start, end)
+        self._send_midi(sysex_message)
+        if self._traffic_monitor is not None:
+            self._traffic_monitor.record_frame(display_index, len(sysex_message), origin)
+
+    def _fit_to_screen(self, text_message):
+        if len(text_message) > SCREEN_WIDTH:
+            text_message = text_message[:SCREEN_WIDTH - 1]
+        return text_message.ljust(SCREEN_WIDTH)
+
+    def _changed_span(self, shown, text):
+        """finds the smallest span of characters that differs between two screen lines
         Arguments:
-            text_message {string} -- text message
-            display_index {iint} -- which screen to display the message
+            shown {string} -- text currently shown on the screen
+            text {string} -- text that should be shown on the screen
         Returns:
-            tuple -- sysex message ready to be sent to MaschineMKiii screens
+            tuple -- (start, end) of the changed span, or None when both lines are identical
         """
-        if len(text_message) > 28:
-            text_message = text_message[:27]
-        sysex_message = [240, 0, 0, 102, 23, 18, min(display_index, 3) * 28]
-        filled = text_message.ljust(28)
-        for c in filled:
-            sysex_message.append(ord(c))
-        sysex_message.append(247)
-        return sysex_message
+        if shown == text:
+            return None
+        start = 0
+        while shown[start] == text[start]:
+            start += 1
+        end = SCREEN_WIDTH
+        while shown[end - 1] == text[end - 1]:
+            end -= 1
+        return start, end
@@ -21,8 +21,6 @@ from ableton.v2.base.util import NamedTuple, clamp, find_if, memoize
 from ableton.v2.control_surface.components.playable import PlayableComponent
 from ableton.v2.control_surface.components.scroll import ScrollComponent
 from ableton.v2.control_surface.control.button import ButtonControl, PlayableControl
-from ableton.v2.base import task
-from functools import partial
 
 
 MAX_START_NOTE = 108
@@ -226,9 +224,5 @@ class MaschineKeyboard(MaschinePadMixin, PlayableComponent, ScrollComponent):
                 pad._release_button()
 
     def _display_scale_and_key_info(self):
-        self._tasks.clear()
-        self._info_display.clear_display(3)
         message = 'Key - {} | Scale - {}'.format(NOTE_NAMES[self.root_note], self.scale.name)
-        display_task = partial(self._info_display.display_message_on_maschine, message, 3)
-        clear_task = partial(self._info_display.clear_display, 3)
-        self._tasks.add(task.sequence(task.run(display_task), task.wait(1.5), task.run(clear_task)))
+        self._info_display.display_temporary_message_on_maschine(message, 3, 1.5, owner=self)
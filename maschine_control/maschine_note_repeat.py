@@ -13,9 +13,6 @@
 #
 from __future__ import absolute_import, print_function, unicode_literals
 
-from functools import partial
-
-
 from ableton.v2.base import task
 from ableton.v2.base.dependency import depends
 from ableton.v2.base.event import listens
@@ -201,9 +198,7 @@ class MaschineNoteRepeatEnabler(Component):
 
     def _display_message_on_maschine(self, enabled):
         message = 'Note Repeate is {}'.format('Off' if enabled else 'Active')
-        display_task = partial(self._info_display.display_message_on_maschine, message, 3)
-        clear_task = partial(self._info_display.clear_display, 3)
-        self._tasks.add(task.sequence(task.run(display_task), task.wait(2.5), task.run(clear_task)))
+        self._info_display.display_temporary_message_on_maschine(message, 3, 2.5, owner=self)
 
     # ? maybe consider saving and restoring note repeat on track selection ??
     def _restore_note_repeat_enabled_state(self):
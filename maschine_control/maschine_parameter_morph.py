@@ -0,0 +1,219 @@
+#
+# maschine / ableton
+# maschine_parameter_morph.py
+#
+# created by Ahmed Emerah - (MaXaR)
+#
+# NI user name: Emerah
+# NI: Machine MK3, KK S49 MK2, Komplete 12.
+# email: ahmed.emerah@icloud.com
+#
+# developed using python 2.7.17 on macOS Catalina
+# tools: VS Code (Free)
+#
+from __future__ import absolute_import, print_function, unicode_literals
+
+from array import array
+
+from ableton.v2.base import task
+from ableton.v2.base.dependency import depends
+from ableton.v2.base.event import listens
+from ableton.v2.control_surface.component import Component
+from ableton.v2.control_surface.control.button import ButtonControl
+
+MORPH_SCREEN = 3
+MAX_STRIP_VALUE = 127.0
+GESTURE_TIMEOUT = 0.5
+
+
+class MaschineMorphEngine(object):
+    """
+    interpolates the parameters of a device between two captured states.
+    every parameter that differs between the states gets a precomputed (start, delta, quantized)
+    entry in flat arrays, so applying a morph position is a single pass over those arrays.
+    quantized parameters jump to the nearest step, and unchanged values are not written again.
+    the first position is always written, whatever values the device has.
+    """
+
+    def __init__(self, parameters, state_a, state_b, *a, **k):
+        """Arguments:
+            parameters {sequence} -- the device parameters, in the order of the states
+            state_a {array} -- parameter values at morph position 0
+            state_b {array} -- parameter values at morph position 1
+        """
+        super(MaschineMorphEngine, self).__init__(*a, **k)
+        self._parameters = []
+        self._starts = array(b'd')
+        self._deltas = array(b'd')
+        self._quantized = array(b'b')
+        for index, parameter in enumerate(parameters[:min(len(state_a), len(state_b))]):
+            delta = state_b[index] - state_a[index]
+            if delta == 0 or not parameter.is_enabled or parameter.state != 0:
+                continue
+            self._parameters.append(parameter)
+            self._starts.append(state_a[index])
+            self._deltas.append(delta)
+            self._quantized.append(1 if parameter.is_quantized else 0)
+        self._written = array(b'd', [float('nan')] * len(self._parameters))
+
+    def __len__(self):
+        return len(self._parameters)
+
+    def apply(self, position):
+        """writes the parameter values of a morph position.
+        returns the number of parameters written.
+        Arguments:
+            position {float} -- 0.0 for state A through 1.0 for state B
+        """
+        written = 0
+        for index, parameter in enumerate(self._parameters):
+            value = self._starts[index] + self._deltas[index] * position
+            if self._quantized[index]:
+                value = float(round(value))
+            if value != self._written[index]:
+                self._written[index] = value
+                parameter.value = value
+                written += 1
+        return written
+
+
+class MaschineParameterMorph(Component):
+    """
+    moves the selected device between the captured A and B states with the touch strip.
+    strip movements only store the latest position, the parameters are written once per
+    control surface tick. a gesture on the strip is a single bulk write of the device component,
+    so it is one step in Live's undo history. the gesture ends when the strip rests for GESTURE_TIMEOUT.
+    """
+
+    @depends(info_display=None)
+    def __init__(self, info_display=None, device_component=None, *a, **k):
+        assert info_display is not None
+        assert device_component is not None
+        super(MaschineParameterMorph, self).__init__(*a, **k)
+        self._info_display = info_display
+        self._device_component = device_component
+        self._engine = None
+        self._position = None
+        self._in_gesture = False
+        self._apply_task = self._tasks.add(task.run(self._apply_position))
+        self._apply_task.kill()
+        self._gesture_task = self._tasks.add(task.sequence(task.wait(GESTURE_TIMEOUT), task.run(self._end_gesture)))
+        self._gesture_task.kill()
+
+    def disconnect(self):
+        self._end_gesture()
+        super(MaschineParameterMorph, self).disconnect()
+
+    def set_morph_strip(self, strip):
+        self.__on_morph_strip_value.subject = strip
+
+    def set_engine(self, engine):
+        self._apply_task.kill()
+        self._end_gesture()
+        self._engine = engine
+        self._position = None
+
+    @listens('value')
+    def __on_morph_strip_value(self, value):
+        if self._engine is None:
+            return
+        self._position = value / MAX_STRIP_VALUE
+        if not self._in_gesture:
+            self._in_gesture = True
+            self._device_component.begin_bulk_parameter_write()
+        self._gesture_task.restart()
+        if not self._apply_task.is_running:
+            self._apply_task.restart()
+
+    def _end_gesture(self):
+        self._gesture_task.kill()
+        if self._in_gesture:
+            self._in_gesture = False
+            self._device_component.end_bulk_parameter_write()
+
+    def _apply_position(self):
+        if self._engine is not None and self._position is not None:
+            self._engine.apply(self._position)
+            message = 'Morph A {:3d}% B'.format(int(self._position * 100))
+            self._info_display.display_temporary_message_on_maschine(message, MORPH_SCREEN, owner=self)
+
+
+class MaschineParameterMorphEnabler(Component):
+    """
+    this is a wrapper for the parameter morph component. it captures the A and B states of
+    the selected device, and toggles morphing with the touch strip. while morphing, the
+    touch strip does not show the clip position.
+    """
+
+    morph_button = ButtonControl(color='DefaultButton.Off')
+    capture_a_button = ButtonControl(color='DefaultButton.Off', pressed_color='DefaultButton.On')
+    capture_b_button = ButtonControl(color='DefaultButton.Off', pressed_color='DefaultButton.On')
+
+    @depends(info_display=None)
+    def __init__(self, info_display=None, device_component=None, *a, **k):
+        assert info_display is not None
+        assert device_component is not None
+        super(MaschineParameterMorphEnabler, self).__init__(*a, **k)
+        self._info_display = info_display
+        self._device_component = device_component
+        self._states = {}
+        self._state_device = None
+        self.morph_component = MaschineParameterMorph(device_component=device_component, name='Parameter_Morph', parent=self, is_enabled=False)
+        self.__on_selected_device_changed.subject = device_component
+
+    def set_morph_button(self, button):
+        self.morph_button.set_control_element(button)
+
+    def set_capture_a_button(self, button):
+        self.capture_a_button.set_control_element(button)
+
+    def set_capture_b_button(self, button):
+        self.capture_b_button.set_control_element(button)
+
+    @capture_a_button.pressed
+    def _on_capture_a_button_pressed(self, button):
+        self._capture_state('A')
+
+    @capture_b_button.pressed
+    def _on_capture_b_button_pressed(self, button):
+        self._capture_state('B')
+
+    @morph_button.pressed
+    def _on_morph_button_pressed(self, button):
+        if self.morph_component.is_enabled():
+            self._set_morph_enabled(False)
+        elif self._update_engine():
+            self._set_morph_enabled(True)
+        else:
+            self._info_display.display_temporary_message_on_maschine('Capture A and B First', MORPH_SCREEN, owner=self)
+
+    @listens('selected_device')
+    def __on_selected_device_changed(self):
+        if self.morph_component.is_enabled() and not self._update_engine():
+            self._set_morph_enabled(False)
+            self._info_display.display_temporary_message_on_maschine('Morph Off - Device Changed', MORPH_SCREEN, owner=self)
+
+    def _capture_state(self, name):
+        device = self._device_component.device()
+        if device is None:
+            return
+        if self._state_device != device._live_ptr:
+            self._states = {}
+            self._state_device = device._live_ptr
+        self._states[name] = self._device_component.capture_parameter_values()
+        self._info_display.display_temporary_message_on_maschine('Morph {} - {}'.format(name, device.name), MORPH_SCREEN, owner=self)
+        if self.morph_component.is_enabled():
+            self._update_engine()
+
+    def _update_engine(self):
+        device = self._device_component.device()
+        if device is None or device._live_ptr != self._state_device or len(self._states) < 2:
+            return False
+        self.morph_component.set_engine(MaschineMorphEngine(device.parameters, self._states['A'], self._states['B']))
+        return True
+
+    def _set_morph_enabled(self, enabled):
+        self.morph_component.set_enabled(enabled)
+        self.morph_button.color = 'DefaultButton.On' if enabled else 'DefaultButton.Off'
+        if not enabled:
+            self.morph_component.set_engine(None)
@@ -0,0 +1,124 @@
+#
+# maschine / ableton
+# maschine_parameter_randomizer.py
+#
+# created by Ahmed Emerah - (MaXaR)
+#
+# NI user name: Emerah
+# NI: Machine MK3, KK S49 MK2, Komplete 12.
+# email: ahmed.emerah@icloud.com
+#
+# developed using python 2.7.17 on macOS Catalina
+# tools: VS Code (Free)
+#
+from __future__ import absolute_import, print_function, unicode_literals
+
+import random
+from array import array
+
+from ableton.v2.base.live_api_utils import liveobj_valid
+
+SCOPE_BANK = 'Bank'
+SCOPE_DEVICE = 'Device'
+SCOPE_MACROS = 'Macros'
+SCOPES = (SCOPE_BANK, SCOPE_DEVICE, SCOPE_MACROS)
+NUM_MACROS = 8
+AMOUNT_STEP = 0.05
+MAX_SEED = 99999
+
+
+class MaschineParameterRandomizer(object):
+    """
+    computes random values for the parameters of a device.
+        - scope: the parameters of the current bank, the whole device, or the macros of a rack
+        - amount: how far a value may move from its current value, 1.0 reaches the whole parameter range
+        - include_quantized: quantized parameters pick another one of their value items, at most
+          max(1, amount * number of items) items away from the current one
+        - seed: every randomization draws from its own seeded generator, the same seed on the same
+          starting values gives the same result
+
+    values are computed in a single pass over flat arrays before anything is written,
+    so the device component can apply them as one batch.
+    """
+
+    def __init__(self, scope=SCOPE_BANK, amount=1.0, include_quantized=False, *a, **k):
+        """Keyword Arguments:
+            scope {string} -- one of SCOPES (default: {SCOPE_BANK})
+            amount {float} -- 0.0 to 1.0 (default: {1.0})
+            include_quantized {bool} -- randomize quantized parameters too (default: {False})
+        """
+        super(MaschineParameterRandomizer, self).__init__(*a, **k)
+        assert scope in SCOPES
+        self.scope = scope
+        self.amount = amount
+        self.include_quantized = include_quantized
+
+    @property
+    def settings_text(self):
+        return '{} {:d}%{}'.format(self.scope, int(round(self.amount * 100)), ' +Q' if self.include_quantized else '')
+
+    def cycle_scope(self):
+        self.scope = SCOPES[(SCOPES.index(self.scope) + 1) % len(SCOPES)]
+
+    def change_amount(self, steps):
+        self.amount = min(1.0, max(AMOUNT_STEP, self.amount + steps * AMOUNT_STEP))
+
+    def toggle_quantized(self):
+        self.include_quantized = not self.include_quantized
+
+    def new_seed(self):
+        return random.randint(1, MAX_SEED)
+
+    def target_parameters(self, device, bank_parameters):
+        """returns the parameters in scope that can be written.
+        the first device parameter (device on/off) is never randomized.
+        Arguments:
+            device {Device} -- the selected device
+            bank_parameters {list} -- the parameters of the current bank
+        """
+        if self.scope == SCOPE_BANK:
+            parameters = bank_parameters
+        elif self.scope == SCOPE_MACROS:
+            parameters = device.parameters[1:NUM_MACROS + 1] if device.can_have_chains else []
+        else:
+            parameters = device.parameters[1:]
+        on_off = device.parameters[0] if device.parameters else None
+        return [parameter for parameter in parameters if liveobj_valid(parameter) and parameter != on_off and parameter.is_enabled and
+                parameter.state == 0 and (self.include_quantized or not parameter.is_quantized)]
+
+    def values(self, parameters, seed):
+        """returns an array with a random value for every parameter, in parameter order.
+        Arguments:
+            parameters {list} -- parameters returned by target_parameters()
+            seed {int} -- the generator seed
+        """
+        generator = random.Random(seed)
+        amount = self.amount
+        currents = array(b'd', (parameter.value for parameter in parameters))
+        minimums = array(b'd', (parameter.min for parameter in parameters))
+        ranges = array(b'd', (parameter.max - parameter.min for parameter in parameters))
+        item_counts = array(b'i', (self._item_count(parameter) for parameter in parameters))
+        values = array(b'd', currents)
+        for index in xrange(len(values)):
+            item_count = item_counts[index]
+            if item_count:
+                values[index] = minimums[index] + self._random_item(generator, int(round(currents[index] - minimums[index])), item_count)
+            else:
+                target = minimums[index] + generator.random() * ranges[index]
+                values[index] = currents[index] + (target - currents[index]) * amount
+        return values
+
+    def _random_item(self, generator, item, item_count):
+        """returns an item index other than item, within the amount of items around it"""
+        span = max(1, int(round(self.amount * item_count)))
+        first = max(0, item - span)
+        last = min(item_count - 1, item + span)
+        if last == first:
+            return item
+        choice = first + min(int(generator.random() * (last - first)), last - first - 1)
+        return choice + 1 if choice >= item else choice
+
+    def _item_count(self, parameter):
+        if not parameter.is_quantized:
+            return 0
+        return len(parameter.value_items) or int(parameter.max - parameter.min) + 1
@@ -0,0 +1,70 @@
+#
+# maschine / ableton
+# maschine_parameter_snapshots.py
+#
+# created by Ahmed Emerah - (MaXaR)
+#
+# NI user name: Emerah
+# NI: Machine MK3, KK S49 MK2, Komplete 12.
+# email: ahmed.emerah@icloud.com
+#
+# developed using python 2.7.17 on macOS Catalina
+# tools: VS Code (Free)
+#
+from __future__ import absolute_import, print_function, unicode_literals
+
+from array import array
+from collections import OrderedDict
+
+MAX_SNAPSHOTS = 128
+
+
+def parameter_values(device):
+    """returns the current values of all parameters of a device as an array of doubles, in parameter order"""
+    return array(b'd', (parameter.value for parameter in device.parameters))
+
+
+class MaschineParameterSnapshotStore(object):
+    """
+    keeps a copy of the parameter values of every device, captured the first time the device is seen.
+    snapshots are keyed by device identity and stored as flat arrays of doubles in parameter order.
+    the store holds at most max_snapshots devices and forgets the least recently used one first.
+    """
+
+    def __init__(self, max_snapshots=MAX_SNAPSHOTS, *a, **k):
+        """Keyword Arguments:
+            max_snapshots {int} -- number of devices to keep snapshots of (default: {MAX_SNAPSHOTS})
+        """
+        super(MaschineParameterSnapshotStore, self).__init__(*a, **k)
+        self._max_snapshots = max_snapshots
+        self._snapshots = OrderedDict()
+
+    def __len__(self):
+        return len(self._snapshots)
+
+    def capture(self, device, replace=False):
+        """stores the current parameter values of a device, unless it already has a snapshot.
+        Arguments:
+            device {Device} -- the device to capture
+        Keyword Arguments:
+            replace {bool} -- replace an existing snapshot (default: {False})
+        """
+        device_ptr = device._live_ptr
+        if replace or device_ptr not in self._snapshots:
+            self._snapshots[device_ptr] = parameter_values(device)
+            while len(self._snapshots) > self._max_snapshots:
+                self._snapshots.popitem(last=False)
+        return self.snapshot(device)
+
+    def snapshot(self, device):
+        """returns the parameter values captured for a device, or None if it was never captured"""
+        snapshot = self._snapshots.pop(device._live_ptr, None)
+        if snapshot is not None:
+            self._snapshots[device._live_ptr] = snapshot
+        return snapshot
+
+    def forget(self, device):
+        self._snapshots.pop(device._live_ptr, None)
+
+    def clear(self):
+        self._snapshots.clear()
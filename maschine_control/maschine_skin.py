@@ -13,6 +13,8 @@
 #
 from __future__ import absolute_import, print_function, unicode_literals
 
+import colorsys
+
 from ableton.v2.control_surface.elements.color import Color
 from ableton.v2.control_surface.skin import Skin
 
@@ -97,6 +99,63 @@ class MaschineIndexedColor:
     WHITEBrightFlash = Color(71)
 
 
+# Live 10 track/clip color palette, ordered by color_index
+LIVE_COLOR_PALETTE = (
+    0xFF94A6, 0xFFA529, 0xCC9927, 0xF7F47C, 0xBFFB00, 0x1AFF2F, 0x25FFA8, 0x5CFFE8, 0x8BC5FF, 0x5480E4, 0x92A7FF, 0xD86CE4, 0xE553A0, 0xFFFFFF,
+    0xFF3636, 0xF66C03, 0x99724B, 0xFFF034, 0x87FF67, 0x3DC300, 0x00BFAF, 0x19E9FF, 0x10A4EE, 0x007DC0, 0x886CE4, 0xB677C6, 0xFF39D4, 0xD0D0D0,
+    0xE2675A, 0xFFA374, 0xD3AD71, 0xEDFFAE, 0xD2E498, 0xBAD074, 0x9BC48D, 0xD4FDE1, 0xCDF1F8, 0xB9C1E3, 0xCDBBE4, 0xAE98E5, 0xE5DCE1, 0xA9A9A9,
+    0xC6928B, 0xB78256, 0x99836A, 0xBFBA69, 0xA6BE00, 0x7DB04D, 0x88C2BA, 0x9BB3C4, 0x85A5C2, 0x8393CC, 0xA595B5, 0xBF9FBE, 0xBC7196, 0x7B7B7B,
+    0xAF3333, 0xA95131, 0x724F41, 0xDBC300, 0x85961F, 0x539F31, 0x0A9C8E, 0x236384, 0x1A2F96, 0x2F52A2, 0x624BAD, 0xA34BAD, 0xCC2E6E, 0x3C3C3C)
+
+# approximate hue of each maschine indexed color, by the index of its dim variant
+MASCHINE_HUES = (
+    (4, 0xFF0000), (8, 0xFF4000), (12, 0xFF8000), (16, 0xFFB000), (20, 0xFFFF00), (24, 0x80FF00), (28, 0x00FF00), (32, 0x00FF80),
+    (36, 0x00FFFF), (40, 0x00A0FF), (44, 0x0000FF), (48, 0x4000FF), (52, 0x8000FF), (56, 0xC000FF), (60, 0xFF00FF), (64, 0xFF0080))
+MASCHINE_WHITE = 68
+GREY_SATURATION = 0.2
+BRIGHT_OFFSET = 2
+
+
+def _hsv(rgb):
+    return colorsys.rgb_to_hsv(((rgb >> 16) & 255) / 255.0, ((rgb >> 8) & 255) / 255.0, (rgb & 255) / 255.0)
+
+
+def _nearest_maschine_color(rgb):
+    hue, saturation, _ = _hsv(rgb)
+    if saturation < GREY_SATURATION:
+        return MASCHINE_WHITE
+
+    def hue_distance(entry):
+        distance = abs(hue - _hsv(entry[1])[0])
+        return min(distance, 1.0 - distance)
+    return min(MASCHINE_HUES, key=hue_distance)[0]
+
+
+def _build_track_colors():
+    """maps every Live palette color to the maschine indexed color with the nearest hue. greys map to white.
+    returns a tuple of (dim, bright) color pairs, indexed by Live color_index.
+    """
+    colors = []
+    for rgb in LIVE_COLOR_PALETTE:
+        index = _nearest_maschine_color(rgb)
+        colors.append((Color(index), Color(index + BRIGHT_OFFSET)))
+    return tuple(colors)
+
+
+TRACK_COLORS = _build_track_colors()
+
+
+def track_color(color_index, is_selected):
+    """returns the maschine color of a Live color_index, bright when selected and dim otherwise, or None for unknown indices.
+    Arguments:
+        color_index {int} -- Live color_index of a track
+        is_selected {bool} -- True if the track is selected
+    """
+    if color_index is None or not 0 <= color_index < len(TRACK_COLORS):
+        return None
+    return TRACK_COLORS[color_index][1 if is_selected else 0]
+
+
 ON = Color(127)
 OFF = Color(0)
 
@@ -0,0 +1,79 @@
+#
+# maschine / ableton
+# maschine_track_context.py
+#
+# created by Ahmed Emerah - (MaXaR)
+#
+# NI user name: Emerah
+# NI: Machine MK3, KK S49 MK2, Komplete 12.
+# email: ahmed.emerah@icloud.com
+#
+# developed using python 2.7.17 on macOS Catalina
+# tools: VS Code (Free)
+#
+from __future__ import absolute_import, print_function, unicode_literals
+
+from ableton.v2.base.dependency import depends
+from ableton.v2.base.event import EventObject, listens
+from ableton.v2.base.live_api_utils import liveobj_valid
+
+from .maschine_track_selection import MASTER_TRACK, RETURN_TRACK
+
+TRACK_CONTEXT_SCREEN = 2
+
+
+class MaschineTrackContextPresenter(EventObject):
+    """
+    the single writer of the selected track context on Maschine MKiii screens.
+    components that follow the selected track feed it through present_track(). the track
+    is classified through the index kept by the track provider, and screen 2 is written
+    only when the presented track or its name really changed.
+    """
+
+    @depends(info_display=None)
+    def __init__(self, info_display=None, track_provider=None, *a, **k):
+        assert info_display is not None
+        assert track_provider is not None
+        super(MaschineTrackContextPresenter, self).__init__(*a, **k)
+        self._info_display = info_display
+        self._track_provider = track_provider
+        self._presented_track = None
+        self._presented_message = None
+        self.__on_tracks_changed.subject = track_provider
+
+    def present_track(self, track):
+        """shows the context of a track on Maschine MKiii screens and follows its name.
+        Arguments:
+            track {Track} -- the selected track
+        """
+        if not liveobj_valid(track):
+            return
+        self.__on_name_changed.subject = track
+        if self._presented_track is None or self._presented_track != track._live_ptr:
+            self._presented_track = track._live_ptr
+            if not track.devices:
+                self._info_display.clear_display(1)
+                self._info_display.clear_display(3)
+        self._present(track)
+
+    def _present(self, track):
+        kind = self._track_provider.track_kind(track)
+        if kind == RETURN_TRACK:
+            message = 'Return - {}'.format(track.name)
+        elif kind == MASTER_TRACK:
+            message = 'Master Track Selected'
+        else:
+            message = 'Track - {}'.format(track.name)
+        if message != self._presented_message:
+            self._presented_message = message
+            self._info_display.display_message_on_maschine(message, TRACK_CONTEXT_SCREEN)
+
+    @listens('name')
+    def __on_name_changed(self):
+        self._present(self.__on_name_changed.subject)
+
+    @listens('tracks')
+    def __on_tracks_changed(self):
+        track = self.__on_name_changed.subject
+        if liveobj_valid(track):
+            self._present(track)
@@ -13,9 +13,7 @@
 #
 from __future__ import absolute_import, print_function, unicode_literals
 
-from functools import partial
 from ableton.v2.base.dependency import depends
-from ableton.v2.base import task
 from ableton.v2.control_surface.component import Component
 from ableton.v2.control_surface.control.button import ButtonControl
 
@@ -78,17 +76,8 @@ class MaschineTrackCreation(Component):
             self.song.create_return_track()
             self._display_message_on_maschine('return')
         else:
-            self._info_display.clear_display(3)
-            self._tasks.clear()
-            message = 'Only 12 sends allowed'
-            display_task = partial(self._info_display.display_message_on_maschine, message, 3)
-            clear_display = partial(self._info_display.clear_display, 3)
-            self._tasks.add(task.sequence(task.run(display_task), task.wait(1), task.run(clear_display)))
+            self._info_display.display_temporary_message_on_maschine('Only 12 sends allowed', 3, 1, owner=self)
 
     def _display_message_on_maschine(self, track_type):
-        self._tasks.clear()
-        self._info_display.clear_display(3)
         message = 'Created New {} Track'.format(track_type)
-        display_task = partial(self._info_display.display_message_on_maschine, message, 3)
-        clear_display = partial(self._info_display.clear_display, 3)
-        self._tasks.add(task.sequence(task.run(display_task), task.wait(1), task.run(clear_display)))
+        self._info_display.display_temporary_message_on_maschine(message, 3, 1, owner=self)
@@ -14,7 +14,6 @@
 from __future__ import absolute_import, print_function, unicode_literals
 
 from ableton.v2.base.dependency import depends
-from ableton.v2.base.event import listens
 from ableton.v2.base.live_api_utils import liveobj_valid
 from ableton.v2.control_surface.component import Component
 from ableton.v2.control_surface.components.scroll import ScrollComponent
@@ -31,16 +30,18 @@ class MaschineTrackNavigator(Component):
 
     master_track_button = ButtonControl(color='DefaultButton.On', pressed_color='DefaultButton.Off')
 
-    @depends(info_display=None)
-    def __init__(self, info_display=None, *a, **k):
+    @depends(info_display=None, track_presenter=None, track_provider=None)
+    def __init__(self, info_display=None, track_presenter=None, track_provider=None, *a, **k):
         assert info_display is not None
+        assert track_presenter is not None
+        assert track_provider is not None
         self._info_display = info_display
+        self._track_presenter = track_presenter
         super(MaschineTrackNavigator, self).__init__(*a, **k)
         self._track_scroller = ScrollComponent(self.track_scroller_type(), parent=self)
         song = self.song
         view = song.view
-        self.register_slot(song, self.__on_selected_track_changed, 'visible_tracks')
-        self.register_slot(song, self.__on_selected_track_changed, 'return_tracks')
+        self.register_slot(track_provider, self.__on_selected_track_changed, 'tracks')
         self.register_slot(view, self.__on_selected_track_changed, 'selected_track')
         self.__on_selected_track_changed()
         self._update_master_track_button()
@@ -77,22 +78,5 @@ class MaschineTrackNavigator(Component):
         if liveobj_valid(track):
             if self.is_enabled():
                 self._track_scroller.update()
-        self.__on_name_changed.subject = track
         self._update_master_track_button()
-        self._display_track_name(track)
-        if not track.devices:
-            self._info_display.clear_display(1)
-            self._info_display.clear_display(3)
-
-    @listens('name')
-    def __on_name_changed(self):
-        track = self.song.view.selected_track
-        self._display_track_name(track)
-
-    def _display_track_name(self, track):
-        if track in self.song.visible_tracks:
-            self._info_display.display_message_on_maschine('Track - {} '.format(track.name), 2)
-        elif track in self.song.return_tracks:
-            self._info_display.display_message_on_maschine('Return - {}'.format(track.name), 2)
-        else:
-            self._info_display.display_message_on_maschine('Master Track Selected', 2)
+        self._track_presenter.present_track(track)
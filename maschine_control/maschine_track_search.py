@@ -0,0 +1,256 @@
+#
+# maschine / ableton
+# maschine_track_search.py
+#
+# created by Ahmed Emerah - (MaXaR)
+#
+# NI user name: Emerah
+# NI: Machine MK3, KK S49 MK2, Komplete 12.
+# email: ahmed.emerah@icloud.com
+#
+# developed using python 2.7.17 on macOS Catalina
+# tools: VS Code (Free)
+#
+from __future__ import absolute_import, print_function, unicode_literals
+
+from bisect import bisect_left, insort
+
+from ableton.v2.base.dependency import depends
+from ableton.v2.base.event import EventObject, listens, listens_group
+from ableton.v2.control_surface.component import Component
+from ableton.v2.control_surface.control.button import ButtonControl
+from ableton.v2.control_surface.control.encoder import StepEncoderControl
+
+SEARCH_SCREEN = 2
+MATCH_SCREEN = 3
+# search messages do not expire, they stay until the search is turned off
+SEARCH_MESSAGE_DURATION = None
+LAST_CHARACTER = '\uffff'
+
+
+class MaschineTrackNameIndex(EventObject):
+    """
+    a prefix index over the names of all tracks, return tracks and the master track.
+    names are kept in a sorted list of (lower case name, track pointer) keys, so the tracks
+    starting with a prefix are found with two binary searches. the list is updated from the
+    track name listeners one track at a time, and reconciled after the coalesced track list
+    rebuild of the track provider.
+    """
+
+    @depends(song=None)
+    def __init__(self, song=None, track_provider=None, *a, **k):
+        assert track_provider is not None
+        super(MaschineTrackNameIndex, self).__init__(*a, **k)
+        self._song = song
+        self._keys = []
+        self._tracks = {}
+        self._names = {}
+        self.__on_track_structure_changed.subject = track_provider
+        self._update_tracks()
+
+    def match_count(self, prefix):
+        """returns the number of tracks whose name starts with prefix (case insensitive)"""
+        start, end = self._match_range(prefix)
+        return end - start
+
+    def match(self, prefix, index=0):
+        """returns a track whose name starts with prefix (case insensitive), in name order.
+        Arguments:
+            prefix {string} -- the first letters of the track name
+        Keyword Arguments:
+            index {int} -- index of the match (default: {0})
+        """
+        start, end = self._match_range(prefix)
+        if not 0 <= index < end - start:
+            return None
+        return self._tracks[self._keys[start + index][1]]
+
+    def next_letters(self, prefix):
+        """returns the letters that follow prefix in the names of the matching tracks, in name order.
+        every letter is found with a binary search, so names that share it are skipped at once.
+        Arguments:
+            prefix {string} -- the first letters of the track name
+        """
+        prefix = prefix.lower()
+        position = len(prefix)
+        start, end = self._match_range(prefix)
+        letters = []
+        while start < end:
+            name = self._keys[start][0]
+            if len(name) > position:
+                letter = name[position]
+                letters.append(letter)
+                start = bisect_left(self._keys, (prefix + letter + LAST_CHARACTER,), start, end)
+            else:
+                start += 1
+        return letters
+
+    def _match_range(self, prefix):
+        prefix = prefix.lower()
+        return bisect_left(self._keys, (prefix,)), bisect_left(self._keys, (prefix + LAST_CHARACTER,))
+
+    def _update_tracks(self):
+        tracks = list(self._song.tracks) + list(self._song.return_tracks) + [self._song.master_track]
+        current_tracks = dict((track._live_ptr, track) for track in tracks)
+        for track_ptr in [track_ptr for track_ptr in self._tracks if track_ptr not in current_tracks]:
+            self._remove_track(track_ptr)
+        for track_ptr, track in current_tracks.iteritems():
+            if track_ptr in self._tracks:
+                self._tracks[track_ptr] = track
+            else:
+                self._add_track(track_ptr, track)
+        self.__on_name_changed.replace_subjects(tracks, identifiers=tracks)
+
+    def _add_track(self, track_ptr, track):
+        name = track.name.lower()
+        self._tracks[track_ptr] = track
+        self._names[track_ptr] = name
+        insort(self._keys, (name, track_ptr))
+
+    def _remove_track(self, track_ptr):
+        key = (self._names.pop(track_ptr), track_ptr)
+        del self._tracks[track_ptr]
+        del self._keys[bisect_left(self._keys, key)]
+
+    @listens_group('name')
+    def __on_name_changed(self, track):
+        track_ptr = track._live_ptr
+        self._remove_track(track_ptr)
+        self._add_track(track_ptr, track)
+
+    @listens('track_structure')
+    def __on_track_structure_changed(self):
+        self._update_tracks()
+
+
+class MaschineTrackSearch(Component):
+    """
+    jumps to a track by the first letters of its name, using the 4-D encoder.
+    turning the encoder cycles the letter at the cursor through the letters that follow the search text
+    in the track names, so every character a name starts with can be found,
+    right adds the letter and moves the cursor on, left removes the last letter, down and up step
+    through the matches, and a click selects the shown match.
+    """
+    __events__ = ('search_finished',)
+
+    letter_encoder = StepEncoderControl()
+    select_button = ButtonControl(color='DefaultButton.Off', pressed_color='DefaultButton.On')
+    next_letter_button = ButtonControl(color='DefaultButton.Off', pressed_color='DefaultButton.On')
+    previous_letter_button = ButtonControl(color='DefaultButton.Off', pressed_color='DefaultButton.On')
+    next_match_button = ButtonControl(color='DefaultButton.Off', pressed_color='DefaultButton.On')
+    previous_match_button = ButtonControl(color='DefaultButton.Off', pressed_color='DefaultButton.On')
+
+    @depends(info_display=None)
+    def __init__(self, info_display=None, name_index=None, *a, **k):
+        assert info_display is not None
+        assert name_index is not None
+        super(MaschineTrackSearch, self).__init__(*a, **k)
+        self._info_display = info_display
+        self._name_index = name_index
+        self._prefix = ''
+        self._letter = None
+        self._match_index = 0
+
+    @property
+    def search_text(self):
+        return self._prefix + (self._letter or '')
+
+    @letter_encoder.value
+    def letter_encoder(self, value, encoder):
+        self._cycle_letter(1 if value > 0 else -1)
+
+    @next_letter_button.pressed
+    def _on_next_letter_button_pressed(self, button):
+        if self._letter is not None:
+            self._prefix += self._letter
+            self._letter = None
+            self._update_display()
+
+    @previous_letter_button.pressed
+    def _on_previous_letter_button_pressed(self, button):
+        if self._letter is not None:
+            self._letter = None
+        else:
+            self._prefix = self._prefix[:-1]
+        self._match_index = 0
+        self._update_display()
+
+    @next_match_button.pressed
+    def _on_next_match_button_pressed(self, button):
+        self._match_index = min(self._match_index + 1, max(0, self._name_index.match_count(self.search_text) - 1))
+        self._update_display()
+
+    @previous_match_button.pressed
+    def _on_previous_match_button_pressed(self, button):
+        self._match_index = max(0, self._match_index - 1)
+        self._update_display()
+
+    @select_button.pressed
+    def _on_select_button_pressed(self, button):
+        track = self._name_index.match(self.search_text, self._match_index)
+        if track is not None:
+            self.song.view.selected_track = track
+        self.notify_search_finished()
+
+    def _cycle_letter(self, step):
+        letters = self._name_index.next_letters(self._prefix)
+        if letters:
+            if self._letter in letters:
+                position = letters.index(self._letter)
+            else:
+                position = -1 if step > 0 else len(letters)
+            self._letter = letters[(position + step) % len(letters)]
+            self._match_index = 0
+        self._update_display()
+
+    def _reset_search(self):
+        self._prefix = ''
+        self._letter = None
+        self._match_index = 0
+
+    def _update_display(self):
+        search_text = self.search_text
+        match_count = self._name_index.match_count(search_text)
+        track = self._name_index.match(search_text, self._match_index)
+        self._info_display.display_temporary_message_on_maschine('Find: {}_'.format(search_text.upper()), SEARCH_SCREEN, duration=SEARCH_MESSAGE_DURATION, owner=self)
+        message = '{} ({}/{})'.format(track.name, self._match_index + 1, match_count) if track is not None else 'No Match'
+        self._info_display.display_temporary_message_on_maschine(message, MATCH_SCREEN, duration=SEARCH_MESSAGE_DURATION, owner=self)
+
+    def update(self):
+        super(MaschineTrackSearch, self).update()
+        if self.is_enabled():
+            self._reset_search()
+            self._update_display()
+        else:
+            self._info_display.remove_temporary_messages(self)
+
+
+class MaschineTrackSearchEnabler(Component):
+    """
+    this is a wrapper for the track search component. it gives a button to
+    start and cancel a track search. the search ends by itself when a track is selected.
+    """
+
+    track_search_button = ButtonControl(color='DefaultButton.Off')
+
+    def __init__(self, track_provider=None, *a, **k):
+        assert track_provider is not None
+        super(MaschineTrackSearchEnabler, self).__init__(*a, **k)
+        self._name_index = self.register_disconnectable(MaschineTrackNameIndex(track_provider=track_provider))
+        self.track_search_component = MaschineTrackSearch(name_index=self._name_index, name='Track_Search', parent=self, is_enabled=False)
+        self.__on_search_finished.subject = self.track_search_component
+
+    def set_track_search_button(self, button):
+        self.track_search_button.set_control_element(button)
+
+    @track_search_button.pressed
+    def _on_track_search_button_pressed(self, button):
+        self._set_search_enabled(not self.track_search_component.is_enabled())
+
+    @listens('search_finished')
+    def __on_search_finished(self):
+        self._set_search_enabled(False)
+
+    def _set_search_enabled(self, enabled):
+        self.track_search_component.set_enabled(enabled)
+        self.track_search_button.color = 'DefaultButton.On' if enabled else 'DefaultButton.Off'
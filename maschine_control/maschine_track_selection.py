@@ -13,71 +13,88 @@
 #
 from __future__ import absolute_import, print_function, unicode_literals
 
-from itertools import izip
+from itertools import islice
 
+from ableton.v2.base import task
 from ableton.v2.base.dependency import depends
-from ableton.v2.base.event import EventObject, listens
-from ableton.v2.base.live_api_utils import liveobj_changed
+from ableton.v2.base.event import EventObject, listens, listens_group
+from ableton.v2.base.live_api_utils import liveobj_changed, liveobj_valid
 from ableton.v2.base.util import forward_property
 from ableton.v2.control_surface.component import Component
 from ableton.v2.control_surface.control.button import ButtonControl
 from ableton.v2.control_surface.control.control_list import control_list
 
+from .maschine_skin import track_color
 
-class MaschineSimpleTrackSlot(EventObject):
-    __module__ = __name__
-    __events__ = ('name', 'color_index')
 
-    def __init__(self, track=None, name='', *a, **k):
-        super(MaschineSimpleTrackSlot, self).__init__(*a, **k)
-        self._track = track
-        self._name = name
-        self.__on_name_changed.subject = self._track if getattr(self._track, 'name_has_listener', None) else None
-        self.__on_color_index_changed.subject = self._track if getattr(self._track, 'color_index_has_listener', None) else None
+class MaschineTrackSlot(object):
+    """
+    a compact view of one track on the selection matrix. slots are pooled and reused by the
+    track lister and hold no Live listeners: the lister listens to the colors of its visible
+    slots while it is enabled, and refreshes the slot values when it starts listening.
+    """
+    __slots__ = ('track', '_live_ptr', 'color_index')
 
-    @property
-    def track(self):
-        return self._track
+    def __init__(self):
+        self.assign(None)
 
-    @property
-    def name(self):
-        return self._name
+    def assign(self, track):
+        self.track = track
+        self._live_ptr = track._live_ptr if track is not None else None
+        self.color_index = None
 
-    @property
-    def color_index(self):
-        return getattr(self._track, 'color_index', None)
+    def refresh(self):
+        """reads the color of the track. returns True if the color changed"""
+        color_index = getattr(self.track, 'color_index', None)
+        color_changed = color_index != self.color_index
+        self.color_index = color_index
+        return color_changed
 
-    @listens('name')
-    def __on_name_changed(self):
-        pass
+    def __eq__(self, other):
+        return self is other or self._live_ptr == getattr(other, '_live_ptr', None)
 
-    @listens('color_index')
-    def __on_color_index_changed(self):
-        pass
+    def __ne__(self, other):
+        return not self == other
 
+    def __hash__(self):
+        return hash(self._live_ptr)
 
-class MaschineTrackSlot(MaschineSimpleTrackSlot):
-    __module__ = __name__
 
-    def __init__(self, track=None, **k):
-        assert track is not None
-        super(MaschineTrackSlot, self).__init__(track=track, name=track.name, **k)
+TRACK = 'track'
+RETURN_TRACK = 'return'
+MASTER_TRACK = 'master'
+INDEX_CHUNK_SIZE = 128
 
-    def __eq__(self, other):
-        return id(self) == id(other) or self._track == other
 
-    def __ne__(self, other):
-        return not self == other
+class MaschineTrackSequence(object):
+    """
+    a read only view over several Live track lists, one after the other.
+    only the lengths of the lists are read up front, a track is read from Live when it is accessed.
+    """
+    __slots__ = ('_parts', '_length')
 
-    def __hash__(self):
-        return hash(self._track)
+    def __init__(self, parts):
+        self._parts = [(part, len(part)) for part in parts]
+        self._length = sum(length for _, length in self._parts)
+
+    def __len__(self):
+        return self._length
 
-    _live_ptr = forward_property('_track')('_live_ptr')
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[position] for position in xrange(*index.indices(self._length))]
+        if index < 0:
+            index += self._length
+        if 0 <= index:
+            for part, length in self._parts:
+                if index < length:
+                    return part[index]
+                index -= length
+        raise IndexError(index)
 
 
 def collect_all_tracks(song):
-    tracks = list(tuple(song.visible_tracks) + tuple(song.return_tracks) + (song.master_track,))
-    return tracks
+    return MaschineTrackSequence((song.visible_tracks, song.return_tracks, (song.master_track,)))
 
 
 def collect_visible_tracks(song):
@@ -94,6 +111,9 @@ class MaschineBasicTrackProvider(EventObject):
     __module__ = __name__
     __events__ = ('tracks', 'selected_track')
 
+    # (offset, length) of the tracks shown by the track lister
+    page_hint = (0, 0)
+
     @property
     def tracks(self):
         return []
@@ -104,23 +124,113 @@ class MaschineBasicTrackProvider(EventObject):
 
 
 class MaschineTrackProvider(MaschineBasicTrackProvider):
+    """
+    provides the tracks shown on the selection matrix.
+    next to the track list it keeps an index from each track to its kind and its position
+    in the list, so the selection matrix and the track context never have to search the
+    Live track lists. the index is rebuilt only when the song track lists change.
+
+    bulk edits in Live (duplicating groups, folding, loading templates) fire many track list
+    notifications in a row. they are coalesced into a single rebuild that runs on the next
+    task group update, and the skipped rebuilds are counted by the traffic monitor.
+    track_structure is notified after every coalesced rebuild, for listeners that follow all
+    the tracks of the song rather than the provided ones.
+
+    in hierarchical mode only the tracks of the current group are provided (the top level
+    tracks, return tracks and master track at the top), independent of folding. the group
+    tree is cached, so folding or unfolding groups costs nothing. Live has no listener for the
+    group of a track, every change of group membership comes as a change of the song track list,
+    so the tree is built again in the coalesced rebuild after such a change.
+
+    large track lists are collected in chunks of INDEX_CHUNK_SIZE tracks, one chunk per task group
+    update. the flat track list is a view over the Live track lists (see MaschineTrackSequence), so
+    tracks are read from Live only as they are indexed. the group tree is built a chunk at a time,
+    and the tracks of the current group are provided as they are found. the tracks around the
+    previous position of the selected track and the page shown by the track lister (page_hint)
+    are indexed first, so the selected track is found and the selection matrix is usable right
+    away. tracks is notified again once the whole list is indexed.
+    """
+
+    __events__ = ('track_structure',)
 
-    @depends(song=None)
-    def __init__(self, song=None, collect_tracks_func=collect_all_tracks, *a, **k):
+    @depends(song=None, parent_task_group=None, traffic_monitor=None)
+    def __init__(self, song=None, parent_task_group=None, traffic_monitor=None, collect_tracks_func=collect_all_tracks, *a, **k):
+        assert parent_task_group is not None
         super(MaschineTrackProvider, self).__init__(*a, **k)
         self._song = song
+        self._traffic_monitor = traffic_monitor
         self._tracks = []
+        self._track_index = {}
         self._selected_track = None
         self._collect_tracks_func = collect_tracks_func
+        self._hierarchical = False
+        self._group_tree = None
+        self._group_tree_builder = None
+        self._current_group = None
+        self._rebuilds_avoided = 0
+        self._rebuild_task = parent_task_group.add(task.run(self._rebuild_tracks))
+        self._rebuild_task.kill()
+        self._collection = iter(())
+        self._index_task = parent_task_group.add(task.FuncTask(self._on_index_tick))
+        self._index_task.kill()
         self.__on_tracks_changed.subject = self._song
+        self.__on_visible_tracks_changed.subject = self._song
+        self.__on_return_tracks_changed.subject = self._song
         self.__on_selected_track_changed.subject = self._song.view
-        self.__on_tracks_changed()
+        self._update_tracks()
         self.__on_selected_track_changed()
 
+    def disconnect(self):
+        self._rebuild_task.kill()
+        self._index_task.kill()
+        super(MaschineTrackProvider, self).disconnect()
+
     @property
     def tracks(self):
         return self._tracks
 
+    @property
+    def rebuilds_avoided(self):
+        return self._rebuilds_avoided
+
+    @property
+    def hierarchical(self):
+        return self._hierarchical
+
+    @hierarchical.setter
+    def hierarchical(self, hierarchical):
+        if hierarchical != self._hierarchical:
+            self._hierarchical = hierarchical
+            self._current_group = None
+            self._update_tracks()
+
+    @property
+    def current_group(self):
+        return self._current_group
+
+    def show_group(self, group):
+        """provides the tracks of a group in hierarchical mode.
+        Arguments:
+            group {Track} -- a group track, or None for the top level tracks
+        """
+        if self._hierarchical and liveobj_changed(self._current_group, group):
+            self._current_group = group
+            self._update_tracks()
+
+    def track_kind(self, track):
+        """returns TRACK, RETURN_TRACK or MASTER_TRACK.
+        Arguments:
+            track {Track} -- the track to classify
+        """
+        return self._track_index.get(track._live_ptr, (TRACK, None))[0]
+
+    def track_position(self, track):
+        """returns the position of a track in the provided track list, or None if it is not provided.
+        Arguments:
+            track {Track} -- the track to look up
+        """
+        return self._track_index.get(track._live_ptr, (TRACK, None))[1]
+
     @property
     def selected_track(self):
         return self._selected_track
@@ -131,13 +241,128 @@ class MaschineTrackProvider(MaschineBasicTrackProvider):
             self._selected_track = track
             self.notify_selected_track()
 
+    def _request_rebuild(self):
+        if self._rebuild_task.is_running:
+            self._rebuilds_avoided += 1
+            if self._traffic_monitor is not None:
+                self._traffic_monitor.record_avoided_track_rebuild()
+        else:
+            self._rebuild_task.restart()
+
+    def _rebuild_tracks(self):
+        self._update_tracks()
+        self.notify_track_structure()
+
     def _update_tracks(self):
-        self._tracks = self._collect_tracks_func(self._song)
+        if self._traffic_monitor is not None:
+            self._traffic_monitor.record_track_rebuild()
+        self._collection = self._collect_tracks()
+        if next(self._collection, False):
+            self._index_task.restart()
+        else:
+            self._index_task.kill()
         self.notify_tracks()
 
+    def _on_index_tick(self, delta):
+        if next(self._collection, False):
+            return True
+        self.notify_tracks()
+        return False
+
+    def _collect_tracks(self):
+        """collects and indexes the provided tracks. every step handles one chunk of tracks and yields
+        True while work is left, the first step runs right away and the others on the next task group updates.
+        """
+        selected_track = self._song.view.selected_track
+        selected_position = self.track_position(selected_track) if liveobj_valid(selected_track) else None
+        self._track_index = dict((track._live_ptr, (RETURN_TRACK, None)) for track in self._song.return_tracks)
+        self._track_index[self._song.master_track._live_ptr] = (MASTER_TRACK, None)
+        num_indexed = 0
+        if self._hierarchical:
+            if self._group_tree is None:
+                self._group_tree = {}
+                self._group_tree_builder = self._build_group_tree(self._group_tree)
+            group = self._current_group
+            group_tree = self._group_tree
+            if self._group_tree_builder is not None:
+                group_ptr = group._live_ptr if liveobj_valid(group) else None
+                self._tracks = []
+                for _ in self._group_tree_builder:
+                    self._tracks = list(group_tree.get(group_ptr, []))
+                    self._index_positions(xrange(num_indexed, len(self._tracks)))
+                    num_indexed = len(self._tracks)
+                    yield True
+                    self.notify_tracks()
+                self._group_tree_builder = None
+            self._tracks = self._collect_group_tracks()
+            if liveobj_changed(self._current_group, group):
+                num_indexed = 0
+        else:
+            self._tracks = self._collect_tracks_func(self._song)
+        num_tracks = len(self._tracks)
+        indexed = bytearray(num_tracks)
+        indexed[:num_indexed] = b'\x01' * num_indexed
+        windows = [(self.page_hint[0], self.page_hint[0] + self.page_hint[1])]
+        if selected_position is not None:
+            windows.insert(0, (selected_position - INDEX_CHUNK_SIZE // 2, selected_position + INDEX_CHUNK_SIZE // 2))
+        for start, end in windows:
+            self._index_positions([position for position in xrange(max(0, start), min(end, num_tracks)) if not indexed[position]], indexed)
+        unindexed_positions = (position for position in xrange(num_tracks) if not indexed[position])
+        positions = list(islice(unindexed_positions, INDEX_CHUNK_SIZE))
+        while positions:
+            self._index_positions(positions, indexed)
+            positions = list(islice(unindexed_positions, INDEX_CHUNK_SIZE))
+            if positions:
+                yield True
+
+    def _index_positions(self, positions, indexed=None):
+        track_index = self._track_index
+        for position in positions:
+            track = self._tracks[position]
+            kind = track_index.get(track._live_ptr, (TRACK, None))[0]
+            track_index[track._live_ptr] = (kind, position)
+            if indexed is not None:
+                indexed[position] = 1
+
+    def _collect_group_tracks(self):
+        if not liveobj_valid(self._current_group) or self._current_group._live_ptr not in self._group_tree:
+            self._current_group = None
+        if self._current_group is None:
+            return self._group_tree.get(None, []) + collect_return_tracks(self._song) + [self._song.master_track]
+        return list(self._group_tree[self._current_group._live_ptr])
+
+    def _build_group_tree(self, group_tree):
+        """maps each group track pointer to the list of its tracks, top level tracks are stored under None.
+        yields after every chunk of tracks.
+        Arguments:
+            group_tree {dict} -- the tree to fill
+        """
+        song_tracks = iter(self._song.tracks)
+        tracks = list(islice(song_tracks, INDEX_CHUNK_SIZE))
+        while tracks:
+            for track in tracks:
+                group_track = track.group_track
+                group_ptr = group_track._live_ptr if liveobj_valid(group_track) else None
+                group_tree.setdefault(group_ptr, []).append(track)
+            yield
+            tracks = list(islice(song_tracks, INDEX_CHUNK_SIZE))
+
     @listens('tracks')
     def __on_tracks_changed(self):
-        self._update_tracks()
+        # a collection still running would read the group tree that is dropped here
+        self._index_task.kill()
+        self._collection = iter(())
+        self._group_tree = None
+        self._group_tree_builder = None
+        self._request_rebuild()
+
+    @listens('visible_tracks')
+    def __on_visible_tracks_changed(self):
+        self._request_rebuild()
+
+    @listens('return_tracks')
+    def __on_return_tracks_changed(self):
+        self._request_rebuild()
 
     @listens('selected_track')
     def __on_selected_track_changed(self):
@@ -211,6 +436,8 @@ class MaschineBasicTrackLister(Component):
         self._track_offset = 0
         self._track_provider = track_provider
         self._tracks = []
+        self._slot_pool = []
+        self._changed_slot_indices = set()
         self._num_visible_tracks = num_visible_tracks
         self.__on_tracks_changed.subject = track_provider
         self.update_tracks()
@@ -250,28 +477,79 @@ class MaschineBasicTrackLister(Component):
         self.update_tracks()
 
     def update_tracks(self):
-        for track in self._tracks:
-            self.disconnect_disconnectable(track)
+        """reconciles the visible slots with the provider tracks. slots of tracks that stay visible
+        are kept, the others go back to the slot pool, and the indices of slots that changed are kept
+        in _changed_slot_indices. only the slots that changed move their listeners.
+        """
         self._adjust_offset()
-        self._tracks = map(self.register_disconnectable, self._create_track_slots())
+        self._track_provider.page_hint = (self._track_offset, self._num_visible_tracks)
+        old_slots = self._tracks
+        old_tracks = [slot.track for slot in old_slots]
+        reusable_slots = dict((slot._live_ptr, slot) for slot in old_slots)
+        new_slots = []
+        for track in self._visible_provider_tracks():
+            slot = reusable_slots.pop(track._live_ptr, None)
+            if slot is None:
+                slot = self._slot_pool.pop() if self._slot_pool else MaschineTrackSlot()
+                slot.assign(track)
+            new_slots.append(slot)
+        for slot in reusable_slots.itervalues():
+            slot.assign(None)
+            self._slot_pool.append(slot)
+        num_slots = max(len(old_slots), len(new_slots))
+        changed_slot_indices = set(index for index in xrange(num_slots)
+                                   if index >= len(old_slots) or index >= len(new_slots) or old_slots[index] is not new_slots[index])
+        self._tracks = new_slots
+        if self.is_enabled():
+            listener = self.__on_track_color_index_changed
+            for index in changed_slot_indices:
+                if index < len(old_tracks) and listener.has_subject(old_tracks[index]):
+                    listener.remove_subject(old_tracks[index])
+            self._listen_to_slots(changed_slot_indices)
+        self._changed_slot_indices = changed_slot_indices
         self.notify_tracks()
 
+    def update(self):
+        super(MaschineBasicTrackLister, self).update()
+        self.__on_track_color_index_changed.replace_subjects([])
+        if self.is_enabled():
+            for index in self._listen_to_slots(xrange(len(self._tracks))):
+                self._on_slot_color_index_changed(index)
+
+    def _listen_to_slots(self, indices):
+        """refreshes the slots at indices and listens to the colors of their tracks.
+        returns the indices of the slots whose color changed.
+        Arguments:
+            indices {iterable} -- indices of slots that have no listener yet
+        """
+        color_changed = set()
+        for index in indices:
+            if index >= len(self._tracks):
+                continue
+            slot = self._tracks[index]
+            if slot.refresh():
+                color_changed.add(index)
+            if getattr(slot.track, 'color_index_has_listener', None):
+                self.__on_track_color_index_changed.add_subject(slot.track, identifier=index)
+        return color_changed
+
+    @listens_group('color_index')
+    def __on_track_color_index_changed(self, index):
+        if self._tracks[index].refresh():
+            self._on_slot_color_index_changed(index)
+
+    def _on_slot_color_index_changed(self, index):
+        pass
+
     def _adjust_offset(self):
         num_tracks = len(self._track_provider.tracks)
         list_length = self._num_visible_tracks
         if list_length >= num_tracks or self._track_offset >= num_tracks - list_length:
             self._track_offset = max(0, num_tracks - list_length)
 
-    def _create_track_slots(self):
-        tracks = self._track_provider.tracks[self.track_offset:]
-        num_slots = min(self._num_visible_tracks, len(tracks))
-        new_tracks = []
-        if num_slots > 0:
-            new_tracks = [self._create_slot(index, track) for index, track in enumerate(tracks[:num_slots]) if track is not None]
-        return new_tracks
-
-    def _create_slot(self, index, track):
-        return MaschineTrackSlot(track=track)
+    def _visible_provider_tracks(self):
+        tracks = self._track_provider.tracks[self.track_offset:self.track_offset + self._num_visible_tracks]
+        return [track for track in tracks if track is not None]
 
 
 class MaschineTrackListerComponent(MaschineBasicTrackLister):
@@ -295,20 +573,31 @@ class MaschineTrackListerComponent(MaschineBasicTrackLister):
     @listens('tracks')
     def __on_tracks_changed(self):
         self.select_buttons.control_count = max(len(self.tracks), self._num_visible_tracks)
-        if self.select_buttons.control_count > len(self.tracks):
-            for button in list(self.select_buttons):
-                button.color = self.color_class_name + '.NoTrack'
+        self._update_select_buttons(self._changed_slot_indices)
         self._scroll_overlay.update_scroll_buttons()
-        # self._update_select_buttons()
 
     @listens('selected_track')
     def __on_selected_track_changed(self):
         self._update_select_buttons()
 
-    def _update_select_buttons(self):
+    def _on_slot_color_index_changed(self, index):
+        self._update_select_buttons(set([index]))
+
+    def _update_select_buttons(self, indices=None):
+        """recolors the select buttons.
+        Keyword Arguments:
+            indices {set} -- only recolor the buttons at these indices. None recolors all of them. (default: {None})
+        """
         selected_track = self._track_provider.selected_track
-        for button, track in izip(self.select_buttons, self.tracks):
-            button.color = self._color_for_button(button.index, track == selected_track)
+        num_tracks = len(self.tracks)
+        for button in self.select_buttons:
+            index = button.index
+            if indices is not None and index not in indices:
+                continue
+            if index < num_tracks:
+                button.color = self._color_for_button(index, self.tracks[index] == selected_track)
+            else:
+                button.color = self.color_class_name + '.NoTrack'
 
     def _color_for_button(self, button_index, is_selected):
         pass
@@ -318,14 +607,18 @@ class MaschineTrackSelection(MaschineTrackListerComponent):
 
     previous_track_page_button = ButtonControl(color='DefaultButton.Off')
     next_track_page_button = ButtonControl(color='DefaultButton.Off')
+    track_hierarchy_button = ButtonControl(color='DefaultButton.Off')
+    parent_group_button = ButtonControl(color='DefaultButton.Off')
 
-    @depends(info_display=None)
-    def __init__(self, info_display=None, track_provider=None, *a, **k):
+    @depends(info_display=None, track_presenter=None)
+    def __init__(self, info_display=None, track_presenter=None, track_provider=None, *a, **k):
         assert info_display is not None
+        assert track_presenter is not None
         self._info_display = info_display
+        self._track_presenter = track_presenter
         self._track_list = track_provider
         super(MaschineTrackSelection, self).__init__(track_provider=self._track_list, *a, **k)
-        self.register_disconnectable(self._track_list)
+        self.__on_provider_tracks_changed.subject = self._track_list
         self.__on_selected_track_changed.subject = self.song.view
         self.__on_selected_track_changed()
         self._update_select_buttons()
@@ -333,11 +626,18 @@ class MaschineTrackSelection(MaschineTrackListerComponent):
     def _color_for_button(self, button_index, is_selected):
         tracks = self.track_provider.tracks
         color = self.color_class_name
-        if button_index > len(self.track_provider.tracks):
+        if button_index + self.track_offset >= len(tracks):
             return color + '.NoTrack'
-        if len(self.song.return_tracks) > 0 and tracks[button_index + self.track_offset] in self.song.return_tracks:
+        track = tracks[button_index + self.track_offset]
+        kind = self.track_provider.track_kind(track)
+        if kind != MASTER_TRACK:
+            color_index = self.tracks[button_index].color_index if button_index < len(self.tracks) else None
+            live_color = track_color(color_index, is_selected)
+            if live_color is not None:
+                return live_color
+        if kind == RETURN_TRACK:
             return color + '.ReturnTrackSelected' if is_selected else color + '.ReturnTrackNotSelected'
-        elif tracks[button_index + self.track_offset] == self.song.master_track:
+        elif kind == MASTER_TRACK:
             return color + '.MasterTrackSelected' if is_selected else color + '.MasterTrackNotSelected'
         else:
             return color + '.TrackSelected' if is_selected else color + '.TrackNotSelected'
@@ -347,25 +647,30 @@ class MaschineTrackSelection(MaschineTrackListerComponent):
         return self.track_provider.selected_track
 
     @listens('tracks')
-    def __on_tracks_changed(self):
-        self._update_select_buttons()
-        self._scroll_overlay.update_scroll_buttons()
+    def __on_provider_tracks_changed(self):
+        self._update_track_offset()
 
     @listens('selected_track')
     def __on_selected_track_changed(self):
         current_track = self.song.view.selected_track
         self._update_track_provider(current_track)
-        # self._update_track_offset()
-        self.__on_name_changed.subject = self.selected_track
-        self._display_track_name(self.selected_track)
-        if not self.selected_track.devices:
-            self._info_display.clear_display(1)
-            self._info_display.clear_display(3)
-
-    @listens('name')
-    def __on_name_changed(self):
-        track = self.selected_track
-        self._display_track_name(track)
+        self._update_track_offset(follow_groups=True)
+        self._track_presenter.present_track(self.selected_track)
+
+    @track_hierarchy_button.pressed
+    def _on_track_hierarchy_button_pressed(self, button):
+        self._track_list.hierarchical = not self._track_list.hierarchical
+        self._update_track_offset(follow_groups=True)
+        self._update_hierarchy_buttons()
+        message = 'Track Hierarchy On' if self._track_list.hierarchical else 'Track Hierarchy Off'
+        self._info_display.display_temporary_message_on_maschine(message, 2, duration=1.5, owner=self)
+
+    @parent_group_button.pressed
+    def _on_parent_group_button_pressed(self, button):
+        group = self._track_list.current_group
+        if group is not None:
+            self._show_group(group.group_track if group.is_grouped else None)
+            self._show_track_page(group)
 
     @previous_track_page_button.pressed
     def _on_previous_track_page_button_pressed(self, button):
@@ -412,27 +717,45 @@ class MaschineTrackSelection(MaschineTrackListerComponent):
     def _update_track_provider(self, track):
         self._track_list.selected_track = track
 
-    # def _update_track_offset(self):
-    #     # offset = self.track_offset
-    #     tracks = self.track_provider.tracks
-    #     index = tracks.index(self.track_provider.selected_track)
-    #     new_offset = index / self._num_visible_tracks
-    #     print(new_offset)
-    #     self.track_offset = new_offset
-    #     self._create_track_slots()
-
-    def _display_track_name(self, track):
-        if track in self.song.visible_tracks:
-            self._info_display.display_message_on_maschine('Track - {} '.format(track.name), 2)
-        elif track in self.song.return_tracks:
-            self._info_display.display_message_on_maschine('Return - {}'.format(track.name), 2)
-        else:
-            self._info_display.display_message_on_maschine('Master Track Selected', 2)
+    def _update_track_offset(self, follow_groups=False):
+        """follows the selected track: the pages move only when the selected track leaves the current page.
+        Keyword Arguments:
+            follow_groups {bool} -- in hierarchical mode, show the group of the selected track when it is not provided (default: {False})
+        """
+        track = self.selected_track
+        if not liveobj_valid(track):
+            return
+        if follow_groups and self._track_list.hierarchical and self.track_provider.track_position(track) is None:
+            if track != self._track_list.current_group:
+                self._show_group(track.group_track if track.is_grouped else None)
+        self._show_track_page(track)
+
+    def _show_track_page(self, track):
+        position = self.track_provider.track_position(track)
+        if position is None:
+            return
+        if self.track_offset <= position < self.track_offset + self._num_visible_tracks:
+            return
+        self.track_offset = position - position % self._num_visible_tracks
+
+    def _show_group(self, group):
+        self._track_list.show_group(group)
+        self.track_offset = 0
+        self._update_hierarchy_buttons()
+        message = 'Group - {}'.format(group.name) if group is not None else 'Top Level Tracks'
+        self._info_display.display_temporary_message_on_maschine(message, 2, duration=1.5, owner=self)
+
+    def _update_hierarchy_buttons(self):
+        self.track_hierarchy_button.color = 'DefaultButton.On' if self._track_list.hierarchical else 'DefaultButton.Off'
+        self.parent_group_button.color = 'DefaultButton.On' if self._track_list.current_group is not None else 'DefaultButton.Off'
 
     def _on_select_button_pressed(self, button):
-        if button.index > len(self.track_provider.tracks):
+        if button.index >= len(self.tracks):
             return
-        self._select_track(self.tracks[button.index].track)
+        track = self.tracks[button.index].track
+        self._select_track(track)
+        if self._track_list.hierarchical and track.is_foldable:
+            self._show_group(track)
 
 
 class MaschineTrackSelectionEnabler(Component):
@@ -0,0 +1,191 @@
+#
+# maschine / ableton
+# maschine_traffic_monitor.py
+#
+# created by Ahmed Emerah - (MaXaR)
+#
+# NI user name: Emerah
+# NI: Machine MK3, KK S49 MK2, Komplete 12.
+# email: ahmed.emerah@icloud.com
+#
+# developed using python 2.7.17 on macOS Catalina
+# tools: VS Code (Free)
+#
+from __future__ import absolute_import, print_function, unicode_literals
+
+import time
+from collections import Counter
+
+from ableton.v2.base.dependency import depends
+from ableton.v2.control_surface.component import Component
+from ableton.v2.control_surface.control.button import ButtonControl
+
+NUM_SCREENS = 4
+NUM_TOP_ORIGINS = 5
+
+
+class MaschineTrafficMonitor(object):
+    """
+    counts the midi traffic the script sends to Maschine MKiii:
+        - screen frames and bytes, per screen and per second
+        - screen frames that were suppressed because the screen already showed the same text
+        - screen writes that were replaced by a later write before being sent
+        - led messages and bytes, and led messages suppressed by the led shadow state
+        - Live status bar messages shown and suppressed
+        - track list rebuilds, and rebuilds avoided by coalescing track list notifications
+        - the components that originated the screen frames, once records_origins is switched on
+
+    use summary() from python, or dump() to write the summary to Live's log.
+    finding the origin of a frame walks the python stack, so it is off by default.
+    """
+
+    def __init__(self, clock=time.time, records_origins=False, *a, **k):
+        """Keyword Arguments:
+            clock {function} -- returns the current time in seconds. (default: {time.time})
+            records_origins {bool} -- count the components that originated the screen frames. (default: {False})
+        """
+        super(MaschineTrafficMonitor, self).__init__(*a, **k)
+        self._clock = clock
+        self.records_origins = records_origins
+        self.reset()
+
+    def reset(self):
+        self._started = self._clock()
+        self._screen_frames = [0] * NUM_SCREENS
+        self._screen_bytes = [0] * NUM_SCREENS
+        self._suppressed_frames = [0] * NUM_SCREENS
+        self._coalesced_writes = [0] * NUM_SCREENS
+        self._origins = Counter()
+        self._led_messages = 0
+        self._led_bytes = 0
+        self._suppressed_led_messages = 0
+        self._status_messages = 0
+        self._suppressed_status_messages = 0
+        self._track_rebuilds = 0
+        self._avoided_track_rebuilds = 0
+        self._current_second = int(self._started)
+        self._frames_this_second = 0
+        self._bytes_this_second = 0
+        self._peak_frames_per_second = 0
+        self._peak_bytes_per_second = 0
+
+    def record_frame(self, display_index, num_bytes, origin=None):
+        self._screen_frames[display_index] += 1
+        self._screen_bytes[display_index] += num_bytes
+        if self.records_origins:
+            self._origins[origin or 'Unknown'] += 1
+        self._count_per_second(num_bytes)
+
+    def record_suppressed_frame(self, display_index):
+        self._suppressed_frames[display_index] += 1
+
+    def record_coalesced_write(self, display_index):
+        self._coalesced_writes[display_index] += 1
+
+    def record_led_message(self, num_bytes):
+        self._led_messages += 1
+        self._led_bytes += num_bytes
+        self._count_per_second(num_bytes)
+
+    def record_suppressed_led_message(self):
+        self._suppressed_led_messages += 1
+
+    def record_status_message(self, suppressed=False):
+        if suppressed:
+            self._suppressed_status_messages += 1
+        else:
+            self._status_messages += 1
+
+    def record_track_rebuild(self):
+        self._track_rebuilds += 1
+
+    def record_avoided_track_rebuild(self):
+        self._avoided_track_rebuilds += 1
+
+    def _count_per_second(self, num_bytes):
+        second = int(self._clock())
+        if second != self._current_second:
+            self._current_second = second
+            self._frames_this_second = 0
+            self._bytes_this_second = 0
+        self._frames_this_second += 1
+        self._bytes_this_second += num_bytes
+        self._peak_frames_per_second = max(self._peak_frames_per_second, self._frames_this_second)
+        self._peak_bytes_per_second = max(self._peak_bytes_per_second, self._bytes_this_second)
+
+    def summary(self):
+        """returns all counters in a dictionary.
+        'messages_per_second' and 'bytes_per_second' are averages since the last reset, the 'peak_' values
+        are the busiest single second. both include screen frames and led messages.
+        """
+        elapsed = max(self._clock() - self._started, 0.001)
+        total_messages = sum(self._screen_frames) + self._led_messages
+        total_bytes = sum(self._screen_bytes) + self._led_bytes
+        return {
+            'elapsed': elapsed,
+            'screen_frames': list(self._screen_frames),
+            'screen_bytes': list(self._screen_bytes),
+            'suppressed_frames': list(self._suppressed_frames),
+            'coalesced_writes': list(self._coalesced_writes),
+            'led_messages': self._led_messages,
+            'led_bytes': self._led_bytes,
+            'suppressed_led_messages': self._suppressed_led_messages,
+            'status_messages': self._status_messages,
+            'suppressed_status_messages': self._suppressed_status_messages,
+            'track_rebuilds': self._track_rebuilds,
+            'avoided_track_rebuilds': self._avoided_track_rebuilds,
+            'messages_per_second': total_messages / elapsed,
+            'bytes_per_second': total_bytes / elapsed,
+            'peak_messages_per_second': self._peak_frames_per_second,
+            'peak_bytes_per_second': self._peak_bytes_per_second,
+            'top_origins': self._origins.most_common(NUM_TOP_ORIGINS),
+        }
+
+    def dump(self, log_message):
+        """writes the summary to Live's log.
+        Arguments:
+            log_message {function} -- the control surface log function
+        """
+        summary = self.summary()
+        log_message('Maschine traffic over {:.1f}s: {:.1f} messages/s, {:.1f} bytes/s (peak {} messages/s, {} bytes/s)'.format(
+            summary['elapsed'], summary['messages_per_second'], summary['bytes_per_second'],
+            summary['peak_messages_per_second'], summary['peak_bytes_per_second']))
+        for display_index in range(NUM_SCREENS):
+            log_message('screen {}: {} frames, {} bytes, {} suppressed, {} coalesced'.format(
+                display_index, summary['screen_frames'][display_index], summary['screen_bytes'][display_index],
+                summary['suppressed_frames'][display_index], summary['coalesced_writes'][display_index]))
+        log_message('leds: {} messages, {} bytes, {} suppressed'.format(
+            summary['led_messages'], summary['led_bytes'], summary['suppressed_led_messages']))
+        log_message('status bar: {} shown, {} suppressed'.format(summary['status_messages'], summary['suppressed_status_messages']))
+        log_message('track list: {} rebuilds, {} avoided'.format(summary['track_rebuilds'], summary['avoided_track_rebuilds']))
+        if self.records_origins:
+            log_message('top origins: {}'.format(', '.join('{} ({})'.format(origin, count) for origin, count in summary['top_origins'])))
+        else:
+            log_message('top origins: not recorded')
+
+
+class MaschineTrafficReport(Component):
+    """
+    dumps the traffic monitor summary to Live's log when the report button is pressed.
+    the first press also switches on origin recording, so the following reports list the top origins.
+    """
+
+    report_button = ButtonControl(color='DefaultButton.Off', pressed_color='DefaultButton.On')
+
+    @depends(traffic_monitor=None)
+    def __init__(self, traffic_monitor=None, log_message=None, *a, **k):
+        assert traffic_monitor is not None
+        assert log_message is not None
+        super(MaschineTrafficReport, self).__init__(*a, **k)
+        self._traffic_monitor = traffic_monitor
+        self._log_message = log_message
+
+    def set_report_button(self, button):
+        self.report_button.set_control_element(button)
+
+    @report_button.pressed
+    def _on_report_button_pressed(self, button):
+        self._traffic_monitor.dump(self._log_message)
+        if not self._traffic_monitor.records_origins:
+            self._traffic_monitor.records_origins = True
+            self._log_message('Maschine traffic origins are recorded from now on')
@@ -13,10 +13,7 @@
 #
 from __future__ import absolute_import, print_function, unicode_literals
 
-from functools import partial
-
 from ableton.v2.base.dependency import depends
-from ableton.v2.base import task
 from ableton.v2.control_surface.component import Component
 from ableton.v2.control_surface.control.button import ButtonControl
 
@@ -61,8 +58,5 @@ class MaschineView(Component):
             pass
 
     def _display_message_on_maschine(self, view):
-        self._tasks.clear()
         message = 'In {} View'.format(view)
-        display_task = partial(self._info_display.display_message_on_maschine, message, 3)
-        clear_task = partial(self._info_display.clear_display, 3)
-        self._tasks.add(task.sequence(task.run(display_task), task.wait(1.5), task.run(clear_task)))
+        self._info_display.display_temporary_message_on_maschine(message, 3, 1.5, owner=self)